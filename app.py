@@ -6,14 +6,32 @@
 """
 
 import json
+import os
 from pathlib import Path
 import re
+import shutil
 import sqlite3
+from secrets import token_urlsafe
+from urllib.parse import quote
 from datetime import date
 import xml.etree.ElementTree as ET
+import numpy as np
 import requests
 import streamlit as st
 from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from jndi_facets import (
+    FACET_KDC, FACET_PUBLISHER, FACET_YEAR, YEAR_UNKNOWN,
+    apply_facets, build_facet_columns, facet_counts, facet_label,
+)
+from query_normalize import normalize_query, query_cache_key
+from result_export import (
+    ALADIN_EXPORT_MAX_RESULTS, ALADIN_EXPORT_PAGE_SIZE, COMMON_FIELDS, NLK_EXPORT_MAX_RESULTS,
+    NLK_EXPORT_PAGE_SIZE, RISS_DIRECT_MAX_RESULTS, RISS_EXPORT_PAGE_SIZE, SOURCE_ALADIN, SOURCE_ALL,
+    SOURCE_FIELDS, SOURCE_JNDI, SOURCE_NLK, SOURCE_RISS,
+    ExportIncomplete, chain_sources, cleanup_exports, iter_paged, write_rows,
+)
 
 
 # -----------------------------
@@ -22,7 +40,8 @@ from concurrent.futures import ThreadPoolExecutor
 AUTHOR = "한국전자통신연구원 배성진(sjbae7@etri.re.kr)"
 LAST_UPDATED_AT = "2026-02-27 08:20"
 DAILY_SEARCH_LIMIT = 1000
-USAGE_DB_PATH = Path(".streamlit") / "usage_limit.db"
+# 부하 테스트(tools/loadtest.py) 등에서 운영 사용량 DB를 건드리지 않도록 환경 변수로 변경 가능
+USAGE_DB_PATH = Path(os.environ.get("NAPI_USAGE_DB_PATH") or Path(".streamlit") / "usage_limit.db")
 
 
 def _init_usage_db() -> None:
@@ -83,7 +102,7 @@ _init_usage_db()
 st.set_page_config(page_title="국가정보정책협의회 분과위원회 TEST", layout="wide")
 st.title("국가정보정책협의회 TEST")
 st.caption("전남연구원 로컬 데이터 + 국립중앙도서관 API + 알라딘 API + RISS 단행본 API")
-st.caption("※RISS는 API 정책상 최대 100건까지만 표출됩니다.")
+st.caption("※RISS는 API 정책상 최대 100건까지만 표출됩니다. (RISS 페이지 프록시 사용 시 제외)")
 st.caption(f"최종 코드 업데이트시간: {LAST_UPDATED_AT}")
 st.caption(f"일일 검색 사용량: {get_today_search_count()}/{DAILY_SEARCH_LIMIT}")
 
@@ -115,6 +134,8 @@ if "query" not in st.session_state:
     st.session_state.query = ""   # 마지막 검색어
 if "jndi_page" not in st.session_state:
     st.session_state.jndi_page = 1
+if "jndi_facets" not in st.session_state:
+    st.session_state.jndi_facets = {}   # 패싯명 → 선택 코드 (jndi_facets.py)
 if "nlk_page" not in st.session_state:
     st.session_state.nlk_page = 1
 if "aladin_page" not in st.session_state:
@@ -135,7 +156,7 @@ with st.form("search_form", clear_on_submit=False):
     submitted = st.form_submit_button("검색")
 
 if submitted:
-    requested_kw = kw.strip()
+    requested_kw = normalize_query(kw)
     if requested_kw:
         ok, _ = try_consume_daily_search_quota()
         if not ok:
@@ -143,6 +164,7 @@ if submitted:
             st.stop()
     st.session_state.query = requested_kw
     st.session_state.jndi_page = 1
+    st.session_state.jndi_facets = {}
     st.session_state.nlk_page = 1
     st.session_state.aladin_page = 1
     st.session_state.riss_page = 1
@@ -161,7 +183,10 @@ if not st.session_state.query:
 # 여기부터는 항상 세션의 query 사용
 # -----------------------------
 PAGE_SIZE = 10
-active_kw = st.session_state.query
+active_kw = st.session_state.query            # 외부 API로 보내는 형태
+active_key = query_cache_key(active_kw)       # 캐시 키 / 위젯 key 용 표준형
+# 설정 시 RISS는 riss_proxy.py를 거쳐 보고 있는 페이지만 가져온다 (미설정 시 100건 일괄)
+RISS_PAGED_PROXY_BASE = st.secrets.get("RISS_PAGED_PROXY_BASE", "").rstrip("/")
 
 # -----------------------------
 # 전남연구원 로컬 JSON 로딩
@@ -190,21 +215,60 @@ def load_jndi_json_best_effort():
                 return [], {"exists": True, "count": 0, "path": str(p), "error": str(e)}
     return [], {"exists": False, "count": 0, "path": None}
 
-def search_jndi(records, keyword: str):
-    """전남연구원 레코드에서 제목 계열 필드 기준 부분일치 검색."""
-    if not keyword:
+JNDI_TITLE_KEYS = ("서명", "서명 ", "서명(국문)", "자료명", "제목", "Title", "title", "TITLE")
+
+def _jndi_title_keys(rec):
+    """레코드의 제목 계열 필드들을 query_cache_key()로 정규화한 튜플"""
+    keys = []
+    for k in JNDI_TITLE_KEYS:
+        v = rec.get(k)
+        if isinstance(v, str):
+            keys.append(query_cache_key(v))
+    return tuple(keys)
+
+@st.cache_data(show_spinner=False)
+def load_jndi_title_keys():
+    """
+    레코드별 정규화 제목 목록 (load_jndi_json_best_effort()와 같은 순서).
+    검색마다 전체 레코드를 다시 정규화하지 않도록 한 번만 계산한다.
+    """
+    records, _ = load_jndi_json_best_effort()
+    return [_jndi_title_keys(rec) for rec in records]
+
+def search_jndi_indices(title_keys, keyword: str):
+    """
+    전남연구원 제목 계열 필드 기준 부분일치 검색.
+    검색어와 제목(load_jndi_title_keys()) 모두 query_cache_key()로 정규화해서 비교하고,
+    일치하는 레코드 인덱스 목록을 반환한다.
+    """
+    low_kw = query_cache_key(keyword)
+    if not low_kw:
         return []
-    key_candidates = ("서명", "서명 ", "서명(국문)", "자료명", "제목", "Title", "title", "TITLE")
-    low_kw = keyword.casefold().strip()
     matched = []
-    for rec in records:
-        for k in key_candidates:
-            v = rec.get(k)
-            if isinstance(v, str) and low_kw in v.casefold().strip():
-                matched.append(rec)
+    for i, keys in enumerate(title_keys):
+        for v in keys:
+            if low_kw in v:
+                matched.append(i)
                 break
     return matched
 
+@st.cache_data(show_spinner=False)
+def search_jndi_cached(keyword: str):
+    """
+    검색어(캐시 키)별 히트 레코드 인덱스 배열.
+    패싯 클릭/페이지 이동으로 다시 실행될 때 카탈로그를 다시 훑지 않도록 캐시한다.
+    """
+    return np.asarray(search_jndi_indices(load_jndi_title_keys(), keyword), dtype=np.int32)
+
+@st.cache_resource(show_spinner=False)
+def load_jndi_facet_columns():
+    """
+    패싯용 정수 코드 열 (jndi_facets.build_facet_columns).
+    읽기 전용 numpy 배열이므로 cache_data처럼 매번 복사하지 않고 세션 간 공유한다.
+    """
+    records, _ = load_jndi_json_best_effort()
+    return build_facet_columns(records)
+
 # -----------------------------
 # 알라딘 API 호출
 # -----------------------------
@@ -226,7 +290,7 @@ def call_aladin_api(keyword: str, page_num: int = 1, page_size: int = 10, query_
 
     # 알라딘은 공식 가이드상 http 엔드포인트 표기.
     # 일부 환경에서 http가 막히면 프록시를 고려하세요.
-    url = "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx"
+    url = st.secrets.get("ALADIN_API_URL", "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx")
     params = {
         "ttbkey": ttbkey,
         "Query": keyword,
@@ -345,7 +409,7 @@ def call_nlk_api(keyword: str, page_num: int = 1, page_size: int = 10):
         st.error("Secrets에 NLK_OPENAPI_KEY (또는 NLK_CERT_KEY)가 없습니다.")
         return [], 0
 
-    url = "https://www.nl.go.kr/NL/search/openApi/search.do"
+    url = st.secrets.get("NLK_API_URL", "https://www.nl.go.kr/NL/search/openApi/search.do")
     params = {
         "key": api_key,
         "apiType": "xml",
@@ -419,7 +483,7 @@ def call_riss_api(keyword: str, rowcount):
         params = {"key": api_key, "version": "1.0", "type": "U", "rowcount": min(max(int(rowcount), 1), 100), "stype": "ab", "keyword": keyword}
     else:
         # 직접 호출(HTTP). Streamlit Cloud에서 HTTP가 막히면 프록시 사용을 권장
-        url = "http://www.riss.kr/openApi"
+        url = st.secrets.get("RISS_API_URL", "http://www.riss.kr/openApi")
         params = {"key": api_key, "version": "1.0", "type": "U", "rowcount": min(max(int(rowcount), 1), 100), "stype": "ab", "keyword": keyword}
 
     headers = {"User-Agent": "Mozilla/5.0 (Streamlit RISS Client)"}
@@ -466,6 +530,26 @@ def call_riss_api(keyword: str, rowcount):
         st.warning(f"RISS API 호출/파싱 오류: {e}")
         return [], 0
 
+def call_riss_page_api(keyword: str, page_num: int = 1, page_size: int = 10):
+    """
+    RISS 페이지 프록시(riss_proxy.py) 호출
+    - 엔드포인트: {RISS_PAGED_PROXY_BASE}/page?keyword=&page=&size=
+    - 프록시가 100건 단위 배치를 서버 측에 캐시하므로 앱은 보고 있는 페이지만 받는다.
+    - 반환: (docs, totalcount, available) — available은 페이지 이동이 가능한 건수
+    - 다른 call_* 함수와 달리 오류를 삼키지 않고 예외를 올린다.
+      (fetch_riss_page 캐시에 빈 결과가 남지 않도록, 경고 표시는 호출하는 쪽에서)
+    """
+    if not keyword:
+        return [], 0, 0
+
+    url = f"{RISS_PAGED_PROXY_BASE}/page"
+    params = {"keyword": keyword, "page": page_num, "size": page_size}
+    headers = {"User-Agent": "Mozilla/5.0 (Streamlit RISS Client)"}
+    r = requests.get(url, params=params, headers=headers, timeout=12)
+    r.raise_for_status()
+    data = r.json()
+    return data.get("docs", []), int(data.get("total", 0)), int(data.get("available", 0))
+
 # -----------------------------
 # 공통 헬퍼
 # -----------------------------
@@ -491,14 +575,19 @@ def make_page_window(current: int, total_pages: int, window: int = 10):
 # 미리가져오기(prefetch)
 # -----------------------------
 PREFETCH_PAGES = 10
+# prefetch_* 함수의 첫 인자는 query_cache_key()로 만든 캐시 키다.
+# 실제 API에는 _upstream_kw(normalize_query() 결과)를 보낸다.
+# st.cache_data는 '_'로 시작하는 인자를 해시하지 않으므로,
+# 대소문자/공백/전각 차이만 있는 검색어는 같은 캐시 항목을 공유한다.
 @st.cache_data(show_spinner=True)
-def prefetch_nlk(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFETCH_PAGES):
+def prefetch_nlk(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFETCH_PAGES, _upstream_kw: str = ""):
     """NLK: 1~pages 페이지까지 미리 가져와서 리스트로 합치기"""
     all_docs, total = [], 0
     if not keyword:
         return all_docs, total
+    upstream_kw = _upstream_kw or keyword
     for p in range(1, pages + 1):
-        docs, t = call_nlk_api(keyword, page_num=p, page_size=page_size)
+        docs, t = call_nlk_api(upstream_kw, page_num=p, page_size=page_size)
         if total == 0:
             total = t
         if not docs:
@@ -510,13 +599,14 @@ def prefetch_nlk(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFETCH
     return all_docs[:pages * page_size], total
 
 @st.cache_data(show_spinner=True)
-def prefetch_aladin(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFETCH_PAGES):
+def prefetch_aladin(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFETCH_PAGES, _upstream_kw: str = ""):
     """알라딘: 1~pages 페이지까지 미리 가져와서 리스트로 합치기"""
     all_docs, total = [], 0
     if not keyword:
         return all_docs, total
+    upstream_kw = _upstream_kw or keyword
     for p in range(1, pages + 1):
-        docs, t = call_aladin_api(keyword, page_num=p, page_size=page_size, query_type="Title")
+        docs, t = call_aladin_api(upstream_kw, page_num=p, page_size=page_size, query_type="Title")
         if total == 0:
             total = t
         if not docs:
@@ -527,26 +617,41 @@ def prefetch_aladin(keyword: str, page_size: int = PAGE_SIZE, pages: int = PREFE
     return all_docs[:pages * page_size], total
 
 @st.cache_data(show_spinner=True)
-def prefetch_riss(keyword: str, rowcount: int = 100):
+def prefetch_riss(keyword: str, rowcount: int = 100, _upstream_kw: str = ""):
     """
     RISS: rowcount=100으로 한 번에 받아오면 끝.
     (이미 최대 100개라 추가 호출 불필요)
     """
-    docs, total = call_riss_api(keyword, rowcount=rowcount)  # 당신의 call_riss_api 최신 시그니처 사용
+    if not keyword:
+        return [], 0
+    docs, total = call_riss_api(_upstream_kw or keyword, rowcount=rowcount)  # 당신의 call_riss_api 최신 시그니처 사용
     return docs, total
 
+@st.cache_data(show_spinner=False)
+def fetch_riss_page(keyword: str, page_num: int, page_size: int = PAGE_SIZE, _upstream_kw: str = ""):
+    """
+    RISS(페이지 프록시 사용 시): 보고 있는 한 페이지만 가져오기
+    (프록시 오류는 예외로 올라오므로 캐시되지 않고 다음 실행에서 다시 시도된다)
+    """
+    return call_riss_page_api(_upstream_kw or keyword, page_num=page_num, page_size=page_size)
+
 # JNDI는 로컬 JSON이므로 별도 네트워크 호출 없음 -> 필터 후 슬라이스만
 
 # ===================== BEGIN: 4열 렌더링 (왼:JNDI · 중1:NLK · 중2:알라딘 · 오른:RISS) =====================
 # ===== 전남연구원 (로컬) =====
 jndi_all, _ = load_jndi_json_best_effort()
-jndi_hits = search_jndi(jndi_all, active_kw)
+jndi_hit_idx = search_jndi_cached(active_key)
+jndi_columns = load_jndi_facet_columns()
+jndi_selected = st.session_state.jndi_facets
+# 패싯 건수/필터는 히트 인덱스 배열 위에서만 계산 (카탈로그 재검색 없음)
+jndi_facet_counts = facet_counts(jndi_columns, jndi_hit_idx, jndi_selected)
+jndi_hits = apply_facets(jndi_columns, jndi_hit_idx, jndi_selected)
 jndi_total = len(jndi_hits)
 jndi_total_pages = max(1, min(PREFETCH_PAGES, (jndi_total + PAGE_SIZE - 1) // PAGE_SIZE))  # 최대 10페이지까지만 노출
 jndi_page = st.session_state.jndi_page
 j_start = (jndi_page - 1) * PAGE_SIZE
 j_end   = j_start + PAGE_SIZE
-jndi_page_data = jndi_hits[j_start:j_end]
+jndi_page_data = [jndi_all[i] for i in jndi_hits[j_start:j_end]]
 
 # 현재 선택 페이지
 nlk_page    = st.session_state.nlk_page
@@ -563,14 +668,30 @@ req_aladin_pages = st.session_state.aladin_prefetched_pages
 # 2) 병렬 prefetch (요청한 pages까지)
 #    외부 API 지연을 줄이기 위해 NLK/알라딘/RISS를 동시에 호출한다.
 with st.spinner("검색중…"):
-    with ThreadPoolExecutor(max_workers=3) as pool:
-        fut_nlk    = pool.submit(prefetch_nlk,    active_kw, PAGE_SIZE, req_nlk_pages)
-        fut_aladin = pool.submit(prefetch_aladin, active_kw, PAGE_SIZE, req_aladin_pages)
-        fut_riss   = pool.submit(prefetch_riss,   active_kw, 100)
+    # 작업 스레드에도 현재 실행 컨텍스트를 붙여야 call_* 안의 st.warning(호출 오류)이 화면에 나온다.
+    with ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx,
+                            initargs=(None, get_script_run_ctx())) as pool:
+        fut_nlk    = pool.submit(prefetch_nlk,    active_key, PAGE_SIZE, req_nlk_pages,    active_kw)
+        fut_aladin = pool.submit(prefetch_aladin, active_key, PAGE_SIZE, req_aladin_pages, active_kw)
+        if RISS_PAGED_PROXY_BASE:
+            # 프록시 경유: 현재 페이지만
+            fut_riss = pool.submit(fetch_riss_page, active_key, riss_page, PAGE_SIZE, active_kw)
+        else:
+            fut_riss = pool.submit(prefetch_riss,   active_key, 100,       active_kw)
 
         nlk_docs_prefetched,    nlk_total    = fut_nlk.result()
         aladin_docs_prefetched, aladin_total = fut_aladin.result()
-        riss_docs_prefetched,   riss_total   = fut_riss.result()
+        riss_error = False
+        if RISS_PAGED_PROXY_BASE:
+            try:
+                riss_page_data, riss_total, riss_count = fut_riss.result()
+            except Exception as e:
+                st.warning(f"RISS 프록시 호출 오류: {e}")
+                riss_page_data, riss_total, riss_count = [], 0, 0
+                riss_error = True
+        else:
+            riss_docs_prefetched, riss_total = fut_riss.result()
+            riss_count = len(riss_docs_prefetched)  # ≤ 100
 
 # API total 기반 전체 페이지(표시용) 계산 — ✅ 여기서는 "캡을 두지 말 것"
 nlk_total_pages_all    = max(1, (nlk_total    + PAGE_SIZE - 1) // PAGE_SIZE)
@@ -589,16 +710,14 @@ need_aladin_pages = min(need_aladin_pages, aladin_total_pages_all)
 
 # 필요시 즉시 확장 prefetch (재호출해도 cache_data가 있어 이미 내려받은 페이지는 빠르게 반환)
 if need_nlk_pages > req_nlk_pages:
-    nlk_docs_prefetched, nlk_total = prefetch_nlk(active_kw, PAGE_SIZE, need_nlk_pages)
+    nlk_docs_prefetched, nlk_total = prefetch_nlk(active_key, PAGE_SIZE, need_nlk_pages, active_kw)
     st.session_state.nlk_prefetched_pages = need_nlk_pages
 
 if need_aladin_pages > req_aladin_pages:
-    aladin_docs_prefetched, aladin_total = prefetch_aladin(active_kw, PAGE_SIZE, need_aladin_pages)
+    aladin_docs_prefetched, aladin_total = prefetch_aladin(active_key, PAGE_SIZE, need_aladin_pages, active_kw)
     st.session_state.aladin_prefetched_pages = need_aladin_pages
 
 # 최종 카운트/표시 페이지 계산 (표시는 전체 페이지, 데이터 슬라이스는 현재 프리패치 범위 내에서)
-riss_count = len(riss_docs_prefetched)  # ≤ 100
-
 # "표시용 전체 페이지"는 API total 기준으로,
 # "실제 슬라이스"는 prefetched 문서에서 자릅니다.
 n_start = (nlk_page - 1) * PAGE_SIZE
@@ -609,9 +728,10 @@ a_start = (aladin_page - 1) * PAGE_SIZE
 a_end   = a_start + PAGE_SIZE
 aladin_page_data = aladin_docs_prefetched[a_start:a_end]
 
-r_start = (riss_page - 1) * PAGE_SIZE
-r_end   = r_start + PAGE_SIZE
-riss_page_data = riss_docs_prefetched[r_start:r_end]
+if not RISS_PAGED_PROXY_BASE:
+    r_start = (riss_page - 1) * PAGE_SIZE
+    r_end   = r_start + PAGE_SIZE
+    riss_page_data = riss_docs_prefetched[r_start:r_end]
 
 
 # 4열 레이아웃
@@ -622,6 +742,29 @@ col_left, col_c1, col_c2, col_right = st.columns([1, 1, 1, 1])
 with col_left:
     st.subheader("전남연구원")
     st.caption(f"총 {jndi_total}건 · {jndi_page}/{jndi_total_pages}페이지")
+    if len(jndi_hit_idx):
+        with st.expander("결과 좁히기", expanded=any(v is not None for v in jndi_selected.values())):
+            year_counts = [(c, n) for c, n in jndi_facet_counts[FACET_YEAR] if c != YEAR_UNKNOWN]
+            if len(year_counts) > 1:
+                st.bar_chart({"발행년도": [str(c) for c, _ in year_counts], "건수": [n for _, n in year_counts]},
+                             x="발행년도", y="건수", height=160)
+            for facet, label in ((FACET_YEAR, "발행년도"), (FACET_PUBLISHER, "발행자"), (FACET_KDC, "분류(KDC)")):
+                current = jndi_selected.get(facet)
+                opts = [c for c, _ in jndi_facet_counts[facet]]
+                if facet == FACET_YEAR:
+                    # 최근 연도부터, '미상'(YEAR_UNKNOWN)은 맨 뒤 그대로
+                    opts = [c for c in reversed(opts) if c != YEAR_UNKNOWN] + [c for c in opts if c == YEAR_UNKNOWN]
+                opts = [None] + opts
+                counts = dict(jndi_facet_counts[facet])
+                sel = st.selectbox(
+                    label, opts,
+                    index=opts.index(current) if current in opts else 0,
+                    format_func=lambda c, f=facet, n=counts: "전체" if c is None else f"{facet_label(jndi_columns, f, c)} ({n.get(c, 0)})",
+                )
+                if sel != current:
+                    st.session_state.jndi_facets = {**jndi_selected, facet: sel}
+                    st.session_state.jndi_page = 1
+                    st.rerun()
     if jndi_page_data:
         for b in jndi_page_data:
             with st.container(border=True):
@@ -641,7 +784,7 @@ with col_left:
             "JNDI 페이지", opts,
             index=opts.index(jndi_page),
             horizontal=True, label_visibility="collapsed",
-            key=f"jndi_radio_{active_kw}",
+            key=f"jndi_radio_{active_key}_{sorted(jndi_selected.items())}",
         )
         st.markdown('</div>', unsafe_allow_html=True)
         if sel != jndi_page:
@@ -673,7 +816,7 @@ with col_c1:
             "NLK 페이지", opts,
             index=opts.index(nlk_page),
             horizontal=True, label_visibility="collapsed",
-            key=f"nlk_radio_{active_kw}",
+            key=f"nlk_radio_{active_key}",
         )
         st.markdown('</div>', unsafe_allow_html=True)
         if sel != nlk_page:
@@ -704,7 +847,7 @@ with col_c2:
             "ALADIN 페이지", opts,
             index=opts.index(aladin_page),
             horizontal=True, label_visibility="collapsed",
-            key=f"aladin_radio_{active_kw}",
+            key=f"aladin_radio_{active_key}",
         )
         st.markdown('</div>', unsafe_allow_html=True)
         if sel != aladin_page:
@@ -714,8 +857,12 @@ with col_c2:
 # ----- RISS -----
 with col_right:
     riss_total_pages = max(1, (riss_count + PAGE_SIZE - 1)//PAGE_SIZE) 
+    if riss_page > riss_total_pages and not riss_error:
+        # 프록시가 제공 가능 건수를 줄여 알려준 경우(원본이 배치 시작 위치를 무시) 마지막 페이지로
+        st.session_state.riss_page = riss_total_pages
+        st.rerun()
     st.subheader("RISS")
-    # total은 전체 건수(100 초과 가능), count는 실제 가져온 수(≤100)
+    # total은 전체 건수, count는 페이지 이동 가능한 건수(직접 호출 ≤100, 프록시 ≤ RISS_PROXY_MAX_RECORDS)
     st.caption(f"총 {riss_total}건 (표시 {riss_count}건) · {riss_page}/{riss_total_pages}페이지")
     if riss_page_data:
         for d in riss_page_data:
@@ -743,10 +890,125 @@ with col_right:
             "RISS 페이지", opts,
             index=opts.index(riss_page),
             horizontal=True, label_visibility="collapsed",
-            key=f"riss_radio_{active_kw}",
+            key=f"riss_radio_{active_key}",
         )
         st.markdown('</div>', unsafe_allow_html=True)
         if sel != riss_page:
             st.session_state.riss_page = int(sel)
             st.rerun()
 # ===================== END: 4열 렌더링 =====================
+
+# ===================== BEGIN: 전체 결과 내보내기 =====================
+# 페이지 캐시(prefetch_*)를 거치지 않고 제공처 API를 페이지 단위로 지연 호출해
+# static/exports/<토큰>/ 아래 파일에 한 줄씩 기록한다. (enableStaticServing으로 내려받기)
+EXPORT_DIR = Path("static") / "exports"
+EXPORT_MAX_AGE_SEC = 3600
+
+# 이미 받아 둔 total 기준 예상 건수 (진행률 계산, 첫 페이지 호출 실패 판정)
+export_expected = {
+    SOURCE_JNDI: jndi_total,
+    SOURCE_NLK: min(nlk_total, NLK_EXPORT_MAX_RESULTS),
+    SOURCE_ALADIN: min(aladin_total, ALADIN_EXPORT_MAX_RESULTS),
+    SOURCE_RISS: riss_count,
+}
+export_expected[SOURCE_ALL] = sum(export_expected.values())
+
+def _riss_export_page(page_num: int, page_size: int):
+    docs, _, available = call_riss_page_api(active_kw, page_num=page_num, page_size=page_size)
+    return docs, available
+
+def _riss_direct_export_page(page_num: int, page_size: int):
+    # 직접 호출은 페이지 파라미터가 없으므로 첫 페이지(최대 100건)만
+    return call_riss_api(active_kw, rowcount=page_size) if page_num == 1 else ([], 0)
+
+def iter_export_docs(source: str):
+    """제공처별 전체 결과 제너레이터 (호출 시점에는 아직 API를 부르지 않음)"""
+    if source == SOURCE_JNDI:
+        return (jndi_all[i] for i in jndi_hits)
+    if source == SOURCE_NLK:
+        return iter_paged(
+            lambda p, s: call_nlk_api(active_kw, page_num=p, page_size=s),
+            NLK_EXPORT_PAGE_SIZE,
+            max_records=NLK_EXPORT_MAX_RESULTS, expected_total=export_expected[source],
+        )
+    if source == SOURCE_ALADIN:
+        return iter_paged(
+            lambda p, s: call_aladin_api(active_kw, page_num=p, page_size=s, query_type="Title"),
+            ALADIN_EXPORT_PAGE_SIZE,
+            max_records=ALADIN_EXPORT_MAX_RESULTS, expected_total=export_expected[source],
+        )
+    if RISS_PAGED_PROXY_BASE:
+        return iter_paged(_riss_export_page, RISS_EXPORT_PAGE_SIZE, expected_total=export_expected[source])
+    return iter_paged(
+        _riss_direct_export_page, RISS_DIRECT_MAX_RESULTS,
+        max_records=RISS_DIRECT_MAX_RESULTS, expected_total=export_expected[source],
+    )
+
+st.write("---")
+with st.expander("전체 결과 내보내기"):
+    if st.session_state.get("export_cancel"):
+        st.info("내보내기를 취소했습니다.")
+    ec1, ec2 = st.columns([2, 1])
+    export_source = ec1.selectbox("대상", (SOURCE_ALL, SOURCE_JNDI, SOURCE_NLK, SOURCE_ALADIN, SOURCE_RISS))
+    export_fmt = ec2.radio("형식", ("csv", "jsonl"), horizontal=True)
+    st.caption(
+        f"예상 {export_expected[export_source]}건 · 국립중앙도서관은 최대 {NLK_EXPORT_MAX_RESULTS}건, "
+        f"알라딘은 API 정책상 최대 {ALADIN_EXPORT_MAX_RESULTS}건"
+    )
+
+    if st.button("내보내기 시작"):
+        st.session_state.pop("export_done", None)
+        # 실행 중 아무 위젯이나 누르면 Streamlit이 현재 실행을 멈추고 재실행하므로,
+        # '취소'는 그 재실행을 일으키는 버튼이다. (취소·오류 시 아래 finally에서 부분 파일 삭제)
+        st.button("취소", key="export_cancel")
+        progress = st.progress(0.0, text="내보내는 중…")
+        expected = max(export_expected[export_source], 1)
+
+        def _on_progress(written):
+            progress.progress(min(written / expected, 1.0), text=f"내보내는 중… {written}건")
+
+        if export_source == SOURCE_ALL:
+            rows = chain_sources(
+                (src, iter_export_docs(src)) for src in (SOURCE_JNDI, SOURCE_NLK, SOURCE_ALADIN, SOURCE_RISS)
+            )
+            fields = COMMON_FIELDS
+        else:
+            rows = iter_export_docs(export_source)
+            fields = SOURCE_FIELDS[export_source]
+
+        cleanup_exports(EXPORT_DIR, EXPORT_MAX_AGE_SEC)
+        token = token_urlsafe(12)
+        out_dir = EXPORT_DIR / token
+        out_dir.mkdir(parents=True, exist_ok=True)
+        file_name = re.sub(r"[^\w.-]+", "_", f"{export_source}_{active_kw}")[:60] + f".{export_fmt}"
+        completed = False
+        try:
+            written = write_rows(rows, out_dir / file_name, export_fmt, fields, on_progress=_on_progress)
+            completed = True
+        except ExportIncomplete as e:
+            # 중간 페이지 호출 실패 등으로 잘린 파일은 내려받기 링크를 만들지 않는다.
+            progress.empty()
+            st.error(f"제공처 응답이 끊겨 내보내기를 중단했습니다. ({e}) 잠시 후 다시 시도해 주세요.")
+        except Exception as e:
+            progress.empty()
+            st.error(f"내보내기 오류: {e}")
+        finally:
+            if not completed:
+                shutil.rmtree(out_dir, ignore_errors=True)
+
+        if completed:
+            progress.progress(1.0, text=f"완료: {written}건")
+            st.session_state.export_done = {
+                "query": active_key, "href": f"app/static/exports/{token}/{quote(file_name)}",
+                "name": file_name, "written": written,
+            }
+
+    export_done = st.session_state.get("export_done")
+    if export_done and export_done["query"] == active_key:
+        st.markdown(
+            f'<a href="{export_done["href"]}" download="{export_done["name"]}">'
+            f'📥 {export_done["name"]} 내려받기 ({export_done["written"]}건)</a>',
+            unsafe_allow_html=True,
+        )
+        st.caption(f"내려받기 링크는 약 {EXPORT_MAX_AGE_SEC // 60}분 뒤 삭제됩니다.")
+# ===================== END: 전체 결과 내보내기 =====================
@@ -0,0 +1,146 @@
+"""
+전남연구원 로컬 검색 결과 패싯(발행년도 · 발행자 · KDC 분류) 집계.
+
+카탈로그를 한 번 정수 코드 열(numpy 배열)로 바꿔 두고,
+검색 결과(레코드 인덱스 배열)에 대해 np.bincount로 패싯 건수를 센다.
+패싯 선택은 같은 인덱스 배열에 불리언 마스크만 적용하므로 카탈로그를 다시 훑지 않는다.
+"""
+
+import re
+
+import numpy as np
+
+FACET_YEAR = "year"
+FACET_PUBLISHER = "publisher"
+FACET_KDC = "kdc"
+FACET_NAMES = (FACET_YEAR, FACET_PUBLISHER, FACET_KDC)
+
+YEAR_UNKNOWN = 0
+PUBLISHER_UNKNOWN = 0
+KDC_OTHER = 10  # 청구기호가 숫자로 시작하지 않음(G, F, J … 별치기호 등) 또는 없음
+
+KDC_LABELS = (
+    "000 총류", "100 철학", "200 종교", "300 사회과학", "400 자연과학",
+    "500 기술과학", "600 예술", "700 언어", "800 문학", "900 역사", "기타",
+)
+
+_YEAR_RE = re.compile(r"(1[5-9]\d\d|20\d\d)")
+
+
+def _year_code(v) -> int:
+    """발행년도 필드(int/float/str/None) → 연도 정수, 알 수 없으면 YEAR_UNKNOWN"""
+    if isinstance(v, bool):
+        return YEAR_UNKNOWN
+    if isinstance(v, (int, float)):
+        return int(v) if 1500 <= v <= 2099 else YEAR_UNKNOWN
+    if isinstance(v, str):
+        m = _YEAR_RE.search(v)
+        if m:
+            return int(m.group(1))
+    return YEAR_UNKNOWN
+
+
+def _kdc_code(call_no) -> int:
+    """청구기호 첫 글자가 숫자면 KDC 주류(0~9), 아니면 KDC_OTHER"""
+    if isinstance(call_no, str):
+        head = call_no.strip()[:1]
+        if head.isdigit() and head.isascii():
+            return int(head)
+    return KDC_OTHER
+
+
+def build_facet_columns(records):
+    """
+    레코드 목록 → 패싯용 정수 코드 열.
+    반환: {"year": int16[n], "publisher": int32[n], "kdc": int8[n], "publisher_labels": [str, ...]}
+    publisher_labels[0]은 '정보 없음'(PUBLISHER_UNKNOWN)
+    """
+    publisher_labels = ["정보 없음"]
+    publisher_codes = {}
+    years = np.empty(len(records), dtype=np.int16)
+    publishers = np.empty(len(records), dtype=np.int32)
+    kdcs = np.empty(len(records), dtype=np.int8)
+
+    for i, rec in enumerate(records):
+        years[i] = _year_code(rec.get("발행년도"))
+        kdcs[i] = _kdc_code(rec.get("청구기호"))
+        pub = rec.get("발행자")
+        pub = pub.strip() if isinstance(pub, str) else ""
+        if not pub:
+            publishers[i] = PUBLISHER_UNKNOWN
+            continue
+        code = publisher_codes.get(pub)
+        if code is None:
+            code = publisher_codes[pub] = len(publisher_labels)
+            publisher_labels.append(pub)
+        publishers[i] = code
+
+    for arr in (years, publishers, kdcs):
+        arr.flags.writeable = False  # 캐시 공유 객체이므로 읽기 전용
+    return {
+        FACET_YEAR: years,
+        FACET_PUBLISHER: publishers,
+        FACET_KDC: kdcs,
+        "publisher_labels": publisher_labels,
+    }
+
+
+def _facet_mask(columns, hit_idx, selected, skip=None):
+    """selected 중 skip을 뺀 패싯 조건을 hit_idx에 적용한 불리언 마스크"""
+    mask = np.ones(len(hit_idx), dtype=bool)
+    for name in FACET_NAMES:
+        code = selected.get(name)
+        if name == skip or code is None:
+            continue
+        mask &= columns[name][hit_idx] == code
+    return mask
+
+
+def apply_facets(columns, hit_idx, selected):
+    """선택된 패싯을 모두 만족하는 레코드 인덱스만 남긴다."""
+    if not any(selected.get(name) is not None for name in FACET_NAMES):
+        return hit_idx
+    return hit_idx[_facet_mask(columns, hit_idx, selected)]
+
+
+def facet_counts(columns, hit_idx, selected, top_publishers: int = 10):
+    """
+    패싯별 [(코드, 건수), ...] 목록.
+    각 패싯의 건수는 '그 패싯을 뺀 나머지 선택'을 적용한 결과에서 센다.
+    (한 패싯 안에서 다른 값으로 바로 바꿀 수 있도록)
+    - year: 연도 오름차순 (YEAR_UNKNOWN은 맨 뒤)
+    - publisher: 건수 상위 top_publishers개 (+ 선택 중인 발행자)
+    - kdc: 0~9, 기타 순
+    """
+    out = {}
+
+    idx = hit_idx[_facet_mask(columns, hit_idx, selected, skip=FACET_YEAR)]
+    counts = np.bincount(columns[FACET_YEAR][idx])
+    codes = np.flatnonzero(counts)
+    years = [(int(c), int(counts[c])) for c in codes if c != YEAR_UNKNOWN]
+    if len(counts) and counts[YEAR_UNKNOWN]:
+        years.append((YEAR_UNKNOWN, int(counts[YEAR_UNKNOWN])))
+    out[FACET_YEAR] = years
+
+    idx = hit_idx[_facet_mask(columns, hit_idx, selected, skip=FACET_PUBLISHER)]
+    counts = np.bincount(columns[FACET_PUBLISHER][idx], minlength=len(columns["publisher_labels"]))
+    k = min(top_publishers, int(np.count_nonzero(counts)))
+    top = np.argpartition(counts, -k)[-k:] if k else np.array([], dtype=np.int64)
+    top = sorted(top.tolist(), key=lambda c: (-counts[c], c))
+    sel_pub = selected.get(FACET_PUBLISHER)
+    if sel_pub is not None and sel_pub not in top:
+        top.append(sel_pub)
+    out[FACET_PUBLISHER] = [(int(c), int(counts[c])) for c in top]
+
+    idx = hit_idx[_facet_mask(columns, hit_idx, selected, skip=FACET_KDC)]
+    counts = np.bincount(columns[FACET_KDC][idx], minlength=len(KDC_LABELS))
+    out[FACET_KDC] = [(c, int(counts[c])) for c in range(len(KDC_LABELS)) if counts[c]]
+    return out
+
+
+def facet_label(columns, name: str, code: int) -> str:
+    if name == FACET_YEAR:
+        return "미상" if code == YEAR_UNKNOWN else str(code)
+    if name == FACET_PUBLISHER:
+        return columns["publisher_labels"][code]
+    return KDC_LABELS[code]
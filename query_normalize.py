@@ -0,0 +1,58 @@
+"""
+검색어 정규화 유틸리티.
+
+같은 의미의 검색어(대소문자, 연속 공백, 한글 조합형/완성형, 전각 문자 차이)가
+하나의 캐시 키로 모이도록 정규화한다.
+- normalize_query(): 외부 API로 보내는 형태 (NFC · 전각→반각 · 공백 정리만, 대소문자 유지)
+- query_cache_key(): 캐시 키 · 로컬 검색 비교용 형태 (NFKC · casefold 추가)
+
+Streamlit에 의존하지 않으므로 app.py와 tools/ 스크립트가 함께 사용한다.
+"""
+
+import re
+import unicodedata
+
+# 전각 공백(U+3000) 등 유니코드 공백까지 포함
+_WS_RE = re.compile(r"\s+")
+
+# 전각 ASCII(U+FF01~FF5E) → 반각, 전각 공백(U+3000) → 공백
+_FULLWIDTH_TABLE = {cp: cp - 0xFEE0 for cp in range(0xFF01, 0xFF5F)}
+_FULLWIDTH_TABLE[0x3000] = 0x20
+
+
+def _is_compat_jamo(ch: str) -> bool:
+    # 한글 호환 자모(ㄱ, ㅏ …)는 NFKC에서 조합용 자모(U+1100대)로 바뀌어
+    # 자모 검색어가 완성형 제목과 비교되지 않으므로 그대로 둔다.
+    return "ㄱ" <= ch <= "ㆎ"
+
+
+def normalize_query(raw: str) -> str:
+    """
+    외부 API에 보낼 검색어.
+    - NFC로 조합형 한글을 완성형으로 합친다.
+    - 전각 영숫자/기호(ＡＩ, （, ！)와 전각 공백만 반각으로 바꾼다.
+      (①, x², Ⅱ 같은 호환 문자는 사용자가 입력한 그대로 보낸다)
+    - 연속 공백 → 공백 1개, 앞뒤 공백 제거
+    - 대소문자는 바꾸지 않는다.
+    """
+    if not raw:
+        return ""
+    text = unicodedata.normalize("NFC", raw)
+    if not text.isascii():
+        text = text.translate(_FULLWIDTH_TABLE)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def query_cache_key(raw: str) -> str:
+    """
+    캐시 키 / 로컬 부분일치 비교용 표준형.
+    normalize_query() 결과에 문자 단위 NFKC(한글 호환 자모 제외)와 casefold를 적용한다.
+    """
+    text = normalize_query(raw)
+    if not text.isascii():
+        text = "".join(
+            ch if _is_compat_jamo(ch) else unicodedata.normalize("NFKC", ch)
+            for ch in text
+        )
+        text = _WS_RE.sub(" ", text).strip()
+    return text.casefold()
@@ -0,0 +1,163 @@
+"""
+검색 결과 전체 내보내기(CSV / JSONL).
+
+외부 API를 페이지 단위로 지연 호출하는 제너레이터 → 행 변환 → 파일에 한 줄씩 쓰기로
+이어지는 파이프라인이라, 전체 건수와 상관없이 메모리에는 한 페이지만 올라온다.
+
+Streamlit에 의존하지 않는다. (API 호출 함수는 app.py에서 fetch_page로 넘겨받음)
+"""
+
+import csv
+import json
+import shutil
+import time
+from itertools import chain
+from pathlib import Path
+
+# -----------------------------
+# 제공처별 페이지 제한
+# -----------------------------
+NLK_EXPORT_PAGE_SIZE = 100       # NLK OpenAPI pageSize
+NLK_EXPORT_MAX_RESULTS = 1000    # 공용 API 키 보호: 내보내기 1회당 최대 10회 호출
+ALADIN_EXPORT_PAGE_SIZE = 50     # 알라딘 ItemSearch MaxResults 1~50
+ALADIN_EXPORT_MAX_RESULTS = 200  # 알라딘 ItemSearch는 검색 결과를 최대 200건까지만 조회 가능
+RISS_EXPORT_PAGE_SIZE = 50       # riss_proxy.py /page size 상한
+RISS_DIRECT_MAX_RESULTS = 100    # 프록시 없이 직접 호출할 때 rowcount 상한
+
+SOURCE_JNDI = "전남연구원"
+SOURCE_NLK = "국립중앙도서관"
+SOURCE_ALADIN = "알라딘"
+SOURCE_RISS = "RISS"
+SOURCE_ALL = "전체"
+
+# 제공처별 원본 필드 (단일 제공처 내보내기 열 순서)
+SOURCE_FIELDS = {
+    SOURCE_JNDI: ("서명", "저자", "발행자", "발행년도", "등록번호", "청구기호"),
+    SOURCE_NLK: ("TITLE", "AUTHOR", "PUBLISHER", "PUBLISH_YEAR", "ISBN", "DETAIL_LINK"),
+    SOURCE_ALADIN: ("TITLE", "AUTHOR", "PUBLISHER", "PUBDATE", "ISBN13", "LINK", "COVER", "RATING"),
+    SOURCE_RISS: ("TITLE", "AUTHOR", "PUBLISHER", "PUBDATE", "MTYPE", "HOLDINGS", "URL"),
+}
+
+# 전체(통합) 내보내기 공통 열 → 제공처별 원본 필드
+COMMON_FIELDS = ("SOURCE", "TITLE", "AUTHOR", "PUBLISHER", "YEAR", "ID", "LINK")
+COMMON_FIELD_MAP = {
+    SOURCE_JNDI: {"TITLE": "서명", "AUTHOR": "저자", "PUBLISHER": "발행자",
+                  "YEAR": "발행년도", "ID": "등록번호", "LINK": None},
+    SOURCE_NLK: {"TITLE": "TITLE", "AUTHOR": "AUTHOR", "PUBLISHER": "PUBLISHER",
+                 "YEAR": "PUBLISH_YEAR", "ID": "ISBN", "LINK": "DETAIL_LINK"},
+    SOURCE_ALADIN: {"TITLE": "TITLE", "AUTHOR": "AUTHOR", "PUBLISHER": "PUBLISHER",
+                    "YEAR": "PUBDATE", "ID": "ISBN13", "LINK": "LINK"},
+    SOURCE_RISS: {"TITLE": "TITLE", "AUTHOR": "AUTHOR", "PUBLISHER": "PUBLISHER",
+                  "YEAR": "PUBDATE", "ID": None, "LINK": "URL"},
+}
+
+
+# -----------------------------
+# 페이지 순회 제너레이터
+# -----------------------------
+class ExportIncomplete(Exception):
+    """제공처가 예상 건수를 다 주기 전에 빈/짧은 페이지를 돌려줌 (호출 오류 포함)"""
+
+    def __init__(self, written: int, expected: int):
+        super().__init__(f"{expected}건 중 {written}건에서 중단되었습니다.")
+        self.written = written
+        self.expected = expected
+
+
+def iter_paged(fetch_page, page_size: int, max_records=None, expected_total=None):
+    """
+    fetch_page(page_num, page_size) -> (docs, total) 를 1페이지부터 필요한 만큼만 호출하며
+    문서를 하나씩 내보낸다.
+    - expected_total: 검색 화면에서 이미 받아 둔 전체 건수. 첫 페이지 호출이 실패해도
+      ([], 0) 기대 건수를 알 수 있도록 시작값으로 쓴다.
+    - 첫 응답의 total이 있으면 그 값으로 갱신하고, max_records 중 작은 값까지만 가져온다.
+      이후 페이지가 더 작은 total을 알려주면(예: RISS 프록시의 제공 가능 건수 축소) 그 값을 따른다.
+    - 그 건수에 못 미친 채 빈 페이지나 page_size보다 짧은 페이지가 오면 ExportIncomplete.
+      (app.py의 call_* 함수는 오류 시 ([], 0)을 돌려주므로 중간 실패도 여기서 잡힌다)
+    """
+    def capped(n):
+        return n if max_records is None else min(n, max_records)
+
+    page_num, yielded = 1, 0
+    expected = capped(expected_total) if expected_total else None  # 모르면 None
+    while True:
+        docs, total = fetch_page(page_num, page_size)
+        if total and (page_num == 1 or (expected is not None and capped(total) < expected)):
+            expected = capped(total)
+        limit = expected if expected is not None else max_records
+        for doc in docs:
+            if limit is not None and yielded >= limit:
+                return
+            yield doc
+            yielded += 1
+        if limit is not None and yielded >= limit:
+            return
+        if len(docs) < page_size:
+            if expected is not None and yielded < expected:
+                raise ExportIncomplete(yielded, expected)
+            return
+        page_num += 1
+
+
+def to_common_rows(source: str, docs):
+    """제공처 원본 문서 → COMMON_FIELDS 행"""
+    field_map = COMMON_FIELD_MAP[source]
+    for doc in docs:
+        row = {"SOURCE": source}
+        for col, src_key in field_map.items():
+            row[col] = doc.get(src_key, "") if src_key else ""
+        yield row
+
+
+def chain_sources(source_docs):
+    """[(source, docs 이터러블), ...] → 공통 열 행을 순서대로 이어 붙인 제너레이터"""
+    return chain.from_iterable(to_common_rows(src, docs) for src, docs in source_docs)
+
+
+# -----------------------------
+# 파일 쓰기
+# -----------------------------
+def write_rows(rows, path: Path, fmt: str, fieldnames, on_progress=None, progress_every: int = 100):
+    """
+    행 이터러블을 path에 CSV 또는 JSONL로 한 줄씩 기록한다.
+    - on_progress(written): progress_every 행마다 호출
+      (Streamlit에서는 이 호출 지점에서 재실행 요청이 처리되어 내보내기가 취소된다)
+    반환: 기록한 행 수
+    중간에 예외가 나면 rows 제너레이터를 닫아 이후 페이지 호출을 멈춘다.
+    """
+    written = 0
+    # CSV는 엑셀에서 한글이 깨지지 않도록 BOM 포함
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    try:
+        with open(path, "w", encoding=encoding, newline="") as fp:
+            if fmt == "csv":
+                writer = csv.DictWriter(fp, fieldnames=fieldnames, extrasaction="ignore")
+                writer.writeheader()
+                write = writer.writerow
+            else:
+                def write(row):
+                    fp.write(json.dumps({k: row.get(k, "") for k in fieldnames}, ensure_ascii=False))
+                    fp.write("\n")
+            for row in rows:
+                write(row)
+                written += 1
+                if on_progress is not None and written % progress_every == 0:
+                    on_progress(written)
+    finally:
+        close = getattr(rows, "close", None)
+        if close is not None:
+            close()
+    return written
+
+
+def cleanup_exports(export_dir: Path, max_age_sec: int = 3600) -> None:
+    """export_dir 아래에서 max_age_sec보다 오래된 내보내기 폴더 삭제"""
+    if not export_dir.exists():
+        return
+    now = time.time()
+    for p in export_dir.iterdir():
+        try:
+            if p.is_dir() and now - p.stat().st_mtime > max_age_sec:
+                shutil.rmtree(p, ignore_errors=True)
+        except OSError:
+            pass
@@ -0,0 +1,219 @@
+"""
+RISS 페이지 단위 프록시 서비스 (FastAPI).
+
+RISS Open API는 한 번에 최대 100건(rowcount)만 돌려주므로, 이 프록시가
+100건 단위 배치로 원본을 가져와 서버 측에 캐시하고 앱에는 요청한 페이지만 돌려준다.
+
+엔드포인트:
+    GET /page?keyword=...&page=1&size=10
+        → {"keyword", "total", "available", "page", "size", "docs"}
+          total: RISS totalcount, available: 프록시가 제공 가능한 건수(≤ RISS_PROXY_MAX_RECORDS)
+    GET /health
+
+실행:
+    uvicorn riss_proxy:app --port 8081
+    # 외부 호출 없이: tools/stub_upstreams.py를 띄우고 원본 주소를 스텁으로
+    RISS_API_KEY=stub RISS_UPSTREAM_URL=http://127.0.0.1:8090/riss uvicorn riss_proxy:app --port 8081
+
+앱 Secrets에 RISS_PAGED_PROXY_BASE = "http://127.0.0.1:8081" 를 넣으면
+app.py가 보고 있는 페이지만 이 프록시에서 가져온다.
+
+환경 변수:
+    RISS_API_KEY               RISS 인증키
+    RISS_UPSTREAM_URL          기본 http://www.riss.kr/openApi
+    RISS_UPSTREAM_START_PARAM  원본 배치 시작 위치(1-based) 파라미터명, 기본 "start"
+    RISS_PROXY_MAX_RECORDS     키워드당 최대 제공 건수, 기본 1000
+    RISS_PROXY_CACHE_TTL       배치 캐시 유지 시간(초), 기본 3600
+    RISS_PROXY_CACHE_SIZE      캐시할 최대 배치 수, 기본 512
+"""
+
+import os
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+
+import requests
+from fastapi import FastAPI, HTTPException, Query
+
+from query_normalize import normalize_query, query_cache_key
+
+
+# -----------------------------
+# 기본 설정
+# -----------------------------
+RISS_UPSTREAM_URL = os.environ.get("RISS_UPSTREAM_URL", "http://www.riss.kr/openApi")
+RISS_UPSTREAM_START_PARAM = os.environ.get("RISS_UPSTREAM_START_PARAM", "start")
+RISS_BATCH_SIZE = 100  # 원본 rowcount 상한
+RISS_PROXY_MAX_RECORDS = int(os.environ.get("RISS_PROXY_MAX_RECORDS", "1000"))
+RISS_PROXY_CACHE_TTL = int(os.environ.get("RISS_PROXY_CACHE_TTL", "3600"))
+RISS_PROXY_CACHE_SIZE = int(os.environ.get("RISS_PROXY_CACHE_SIZE", "512"))
+MAX_PAGE_SIZE = 50
+
+
+# -----------------------------
+# RISS XML 파싱 (app.py call_riss_api와 같은 필드 구성)
+# -----------------------------
+def parse_riss_xml(text: str):
+    """반환: (docs, totalcount)"""
+    root = ET.fromstring(text)
+    total_str = (root.findtext(".//totalcount") or "0").strip()
+    try:
+        total = int(total_str)
+    except ValueError:
+        total = 0
+
+    docs = []
+    for md in root.findall(".//metadata"):
+        holdings_nodes = md.findall("riss.holdings")
+        docs.append({
+            "TITLE": (md.findtext("riss.title") or "").strip() or "제목 없음",
+            "AUTHOR": (md.findtext("riss.author") or "").strip() or "정보 없음",
+            "PUBLISHER": (md.findtext("riss.publisher") or "").strip() or "정보 없음",
+            "PUBDATE": (md.findtext("riss.pubdate") or "").strip(),
+            "MTYPE": (md.findtext("riss.mtype") or "").strip(),
+            "HOLDINGS": "; ".join([(n.text or "").strip() for n in holdings_nodes if n.text]),
+            "URL": (md.findtext("url") or "").strip(),
+        })
+    return docs, total
+
+
+# -----------------------------
+# 원본 배치 호출
+# -----------------------------
+def fetch_upstream_batch(keyword: str, batch_no: int):
+    """
+    batch_no(0-based)번째 100건 배치를 원본에서 가져온다.
+    반환: (docs, totalcount)
+    """
+    start = batch_no * RISS_BATCH_SIZE + 1
+    api_key = os.environ.get("RISS_API_KEY")
+    if not api_key:
+        raise HTTPException(status_code=500, detail="RISS_API_KEY 환경 변수가 없습니다.")
+    params = {
+        "key": api_key, "version": "1.0", "type": "U",
+        "rowcount": RISS_BATCH_SIZE, "stype": "ab", "keyword": keyword,
+    }
+    if batch_no:
+        params[RISS_UPSTREAM_START_PARAM] = start
+    headers = {"User-Agent": "Mozilla/5.0 (RISS Paging Proxy)"}
+    r = requests.get(RISS_UPSTREAM_URL, params=params, headers=headers, timeout=12)
+    r.raise_for_status()
+    return parse_riss_xml(r.text)
+
+
+# -----------------------------
+# 서버 측 배치 캐시 (TTL + LRU)
+# -----------------------------
+class BatchCache:
+    """(키워드 캐시 키, 배치 번호) → (docs, totalcount)"""
+
+    def __init__(self, max_items: int = RISS_PROXY_CACHE_SIZE, ttl: int = RISS_PROXY_CACHE_TTL):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key):
+        with self._lock:
+            hit = self._items.get(key)
+            if hit is None:
+                return None
+            stored_at, value = hit
+            if time.monotonic() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def get_or_fetch(self, key, fetch):
+        """같은 배치를 여러 요청이 동시에 원본에서 받지 않도록 키별로 직렬화"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                value = self.get(key)
+                if value is None:
+                    value = fetch()
+                    self.put(key, value)
+        finally:
+            # 원본 호출이 실패해도 키별 잠금이 남아 쌓이지 않도록
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return value
+
+
+batch_cache = BatchCache()
+
+
+def get_batch(keyword: str, batch_no: int):
+    cache_key = (query_cache_key(keyword), batch_no)
+    return batch_cache.get_or_fetch(cache_key, lambda: fetch_upstream_batch(keyword, batch_no))
+
+
+def get_page(keyword: str, page: int, size: int):
+    """
+    page(1-based) 한 페이지에 필요한 배치만 가져와 잘라서 반환.
+    반환: (docs, totalcount, available)
+    """
+    first_docs, total = get_batch(keyword, 0)
+    available = min(total, RISS_PROXY_MAX_RECORDS)
+    start = (page - 1) * size
+    end = min(start + size, available)
+    if start >= end:
+        return [], total, available
+
+    docs = []
+    for batch_no in range(start // RISS_BATCH_SIZE, (end - 1) // RISS_BATCH_SIZE + 1):
+        batch_docs = first_docs if batch_no == 0 else get_batch(keyword, batch_no)[0]
+        if batch_no and batch_docs[:1] == first_docs[:1]:
+            # 원본이 시작 위치 파라미터를 무시하고 첫 배치를 다시 준 경우:
+            # 더 가져올 수 있는 건수는 첫 배치까지로 본다.
+            available = len(first_docs)
+            break
+        if not batch_docs:
+            available = batch_no * RISS_BATCH_SIZE
+            break
+        offset = batch_no * RISS_BATCH_SIZE
+        docs.extend(batch_docs[max(start - offset, 0):end - offset])
+    return docs[:size], total, available
+
+
+# -----------------------------
+# FastAPI 앱
+# -----------------------------
+app = FastAPI(title="RISS Paging Proxy")
+
+
+@app.get("/health")
+def health():
+    return {"ok": True}
+
+
+@app.get("/page")
+def page(
+    keyword: str = Query(...),
+    page: int = Query(1, ge=1),
+    size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+):
+    kw = normalize_query(keyword)
+    if not kw:
+        return {"keyword": kw, "total": 0, "available": 0, "page": page, "size": size, "docs": []}
+    try:
+        docs, total, available = get_page(kw, page, size)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"RISS 원본 호출/파싱 오류: {e}")
+    return {"keyword": kw, "total": total, "available": available, "page": page, "size": size, "docs": docs}
@@ -0,0 +1,95 @@
+"""jndi_facets.py 코드 변환 · 패싯 집계 테스트 (작은 가짜 카탈로그 기준)"""
+
+import numpy as np
+import pytest
+
+from jndi_facets import (
+    FACET_KDC, FACET_PUBLISHER, FACET_YEAR, KDC_OTHER, YEAR_UNKNOWN,
+    _kdc_code, _year_code, apply_facets, build_facet_columns, facet_counts, facet_label,
+)
+
+
+@pytest.mark.parametrize("call_no, code", [
+    ("331.5 ㄱ123", 3),
+    (" 909.1", 9),
+    ("G 331", KDC_OTHER),     # 별치기호
+    ("F813", KDC_OTHER),
+    ("３３１", KDC_OTHER),     # 전각 숫자는 KDC로 보지 않음
+    ("", KDC_OTHER),
+    (None, KDC_OTHER),
+])
+def test_kdc_code(call_no, code):
+    assert _kdc_code(call_no) == code
+
+
+@pytest.mark.parametrize("value, year", [
+    ("2019", 2019),
+    ("c2003.", 2003),
+    ("[1998?]", 1998),
+    ("발행년 미상", YEAR_UNKNOWN),
+    (2021.0, 2021),
+    (2021, 2021),
+    (99.0, YEAR_UNKNOWN),
+    (True, YEAR_UNKNOWN),
+    (None, YEAR_UNKNOWN),
+])
+def test_year_code(value, year):
+    assert _year_code(value) == year
+
+
+RECORDS = [
+    {"발행년도": "2020", "발행자": "전남연구원", "청구기호": "331"},
+    {"발행년도": "2020", "발행자": "전남연구원", "청구기호": "911"},
+    {"발행년도": "2021", "발행자": "전남연구원", "청구기호": "331"},
+    {"발행년도": "2021", "발행자": "국토연구원", "청구기호": "331"},
+    {"발행년도": "", "발행자": "국토연구원", "청구기호": "G 100"},
+    {"발행년도": "2019", "발행자": "한국개발연구원", "청구기호": "320"},
+    {"발행년도": "2019", "발행자": "", "청구기호": None},
+]
+
+
+@pytest.fixture
+def columns():
+    return build_facet_columns(RECORDS)
+
+
+def labels(columns, name, pairs):
+    return [(facet_label(columns, name, c), n) for c, n in pairs]
+
+
+def test_counts_without_selection(columns):
+    hits = np.arange(len(RECORDS))
+    counts = facet_counts(columns, hits, {})
+    # 연도 오름차순, 미상은 맨 뒤
+    assert labels(columns, FACET_YEAR, counts[FACET_YEAR]) == [("2019", 2), ("2020", 2), ("2021", 2), ("미상", 1)]
+    assert labels(columns, FACET_PUBLISHER, counts[FACET_PUBLISHER])[:2] == [("전남연구원", 3), ("국토연구원", 2)]
+    assert labels(columns, FACET_KDC, counts[FACET_KDC]) == [("300 사회과학", 4), ("900 역사", 1), ("기타", 2)]
+
+
+def test_counts_are_cross_filtered(columns):
+    hits = np.arange(len(RECORDS))
+    pub = columns["publisher_labels"].index("전남연구원")
+    selected = {FACET_YEAR: 2020, FACET_PUBLISHER: pub, FACET_KDC: None}
+    counts = facet_counts(columns, hits, selected)
+
+    # 연도 패싯: 발행자 조건만 적용 → 전남연구원 3건의 연도 분포 (선택한 2020 외 값도 보임)
+    assert dict(counts[FACET_YEAR]) == {2020: 2, 2021: 1}
+    # 발행자 패싯: 연도 조건만 적용 → 2020년 2건 모두 전남연구원
+    assert dict(counts[FACET_PUBLISHER]) == {pub: 2}
+    # KDC 패싯: 연도 + 발행자 조건 모두 적용
+    assert dict(counts[FACET_KDC]) == {3: 1, 9: 1}
+    assert apply_facets(columns, hits, selected).tolist() == [0, 1]
+
+
+def test_selected_publisher_outside_top_n_is_kept(columns):
+    hits = np.arange(len(RECORDS))
+    pub = columns["publisher_labels"].index("한국개발연구원")
+    counts = facet_counts(columns, hits, {FACET_PUBLISHER: pub}, top_publishers=1)
+    codes = [c for c, _ in counts[FACET_PUBLISHER]]
+    assert codes[0] == columns["publisher_labels"].index("전남연구원")
+    assert codes[-1] == pub and dict(counts[FACET_PUBLISHER])[pub] == 1
+
+
+def test_apply_facets_without_selection_returns_hits(columns):
+    hits = np.array([1, 3, 5], dtype=np.int32)
+    assert apply_facets(columns, hits, {FACET_YEAR: None}) is hits
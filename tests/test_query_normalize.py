@@ -0,0 +1,57 @@
+"""query_normalize.py 검색어 정규화 · 캐시 키 테스트 (tools/sample_queries.txt의 변형 유형 기준)"""
+
+import unicodedata
+
+import pytest
+
+from query_normalize import normalize_query, query_cache_key
+
+
+@pytest.mark.parametrize("variant", [
+    "딥러닝 ",
+    "  딥러닝",
+    unicodedata.normalize("NFD", "딥러닝"),   # 조합형 한글 (macOS 입력 등)
+])
+def test_hangul_variants_share_upstream_form(variant):
+    assert normalize_query(variant) == "딥러닝"
+    assert query_cache_key(variant) == query_cache_key("딥러닝")
+
+
+def test_fullwidth_latin_folds_to_ascii():
+    assert normalize_query("ＣｈａｔＧＰＴ") == "ChatGPT"
+    assert normalize_query("ＬＬＭ（２０２４）！") == "LLM(2024)!"
+
+
+def test_case_kept_upstream_but_folded_in_cache_key():
+    assert normalize_query("Llm") == "Llm"
+    assert {query_cache_key(q) for q in ("LLM", "llm", "Llm", "ＬＬＭ")} == {"llm"}
+
+
+def test_whitespace_collapsed_including_ideographic_space():
+    assert normalize_query("전라남도　") == "전라남도"
+    assert normalize_query("머신  러닝") == "머신 러닝"
+    assert normalize_query("머신　\t러닝") == "머신 러닝"
+    # 띄어쓰기 자체는 다른 검색어로 본다.
+    assert query_cache_key("머신 러닝") != query_cache_key("머신러닝")
+
+
+def test_compat_jamo_kept_as_is():
+    assert normalize_query("ㄱㄴㄷ") == "ㄱㄴㄷ"
+    assert query_cache_key("ㄱㄴㄷ") == "ㄱㄴㄷ"
+    assert query_cache_key("ㅎㅏㄴ글") == "ㅎㅏㄴ글"
+
+
+@pytest.mark.parametrize("raw", ["제①장", "x²", "세계사 Ⅱ", "㈜한국"])
+def test_compat_characters_sent_upstream_unchanged(raw):
+    assert normalize_query(raw) == raw
+
+
+def test_compat_characters_folded_in_cache_key():
+    assert query_cache_key("제①장") == "제1장"
+    assert query_cache_key("세계사 Ⅱ") == query_cache_key("세계사 II")
+
+
+@pytest.mark.parametrize("raw", ["", "   ", "　"])
+def test_empty_queries(raw):
+    assert normalize_query(raw) == ""
+    assert query_cache_key(raw) == ""
@@ -0,0 +1,107 @@
+"""result_export.py 페이지 순회 · 파일 쓰기 테스트 (제공처 API는 가짜 fetch_page로 대체)"""
+
+import csv
+import json
+
+import pytest
+
+from result_export import ExportIncomplete, chain_sources, iter_paged, write_rows
+
+
+def fake_source(total, fail_pages=(), totals=None):
+    """
+    total건을 가진 가짜 제공처. fail_pages의 페이지는 app.py call_* 오류 시처럼 ([], 0).
+    totals: {page_num: 그 페이지가 알려주는 total} (RISS 프록시의 available 축소 흉내)
+    """
+    calls = []
+
+    def fetch_page(page_num, page_size):
+        calls.append(page_num)
+        if page_num in fail_pages:
+            return [], 0
+        page_total = (totals or {}).get(page_num, total)
+        start = (page_num - 1) * page_size
+        return [{"n": i} for i in range(start, min(page_total, start + page_size))], page_total
+
+    fetch_page.calls = calls
+    return fetch_page
+
+
+def numbers(docs):
+    return [d["n"] for d in docs]
+
+
+def test_reads_all_pages():
+    fetch = fake_source(250)
+    assert numbers(iter_paged(fetch, 100)) == list(range(250))
+    assert fetch.calls == [1, 2, 3]
+
+
+def test_total_exact_multiple_of_page_size_stops_without_extra_call():
+    fetch = fake_source(200)
+    assert len(list(iter_paged(fetch, 100))) == 200
+    assert fetch.calls == [1, 2]
+
+
+def test_max_records_caps_rows_and_calls():
+    fetch = fake_source(2540)
+    assert len(list(iter_paged(fetch, 100, max_records=250))) == 250
+    assert fetch.calls == [1, 2, 3]
+
+
+def test_failure_mid_way_raises():
+    fetch = fake_source(250, fail_pages={2})
+    with pytest.raises(ExportIncomplete) as exc:
+        list(iter_paged(fetch, 100))
+    assert (exc.value.written, exc.value.expected) == (100, 250)
+
+
+def test_failure_on_first_page_raises_with_known_total():
+    fetch = fake_source(250, fail_pages={1})
+    with pytest.raises(ExportIncomplete) as exc:
+        list(iter_paged(fetch, 100, max_records=200, expected_total=250))
+    assert (exc.value.written, exc.value.expected) == (0, 200)
+
+
+def test_first_page_total_overrides_known_total():
+    # 검색 이후 원본 건수가 바뀐 경우: 첫 응답의 total을 따른다.
+    fetch = fake_source(120)
+    assert len(list(iter_paged(fetch, 100, expected_total=150))) == 120
+
+
+def test_empty_result_is_not_a_failure():
+    assert list(iter_paged(fake_source(0), 100)) == []
+    assert list(iter_paged(fake_source(0), 100, expected_total=0)) == []
+
+
+def test_smaller_total_on_later_page_lowers_expectation():
+    # RISS 프록시: 1페이지 available=1000 이었다가 원본이 start를 무시해 100으로 줄어듦
+    fetch = fake_source(1000, totals={2: 100, 3: 100})
+    assert len(list(iter_paged(fetch, 50, expected_total=1000))) == 100
+    assert fetch.calls == [1, 2]
+
+
+def test_larger_total_on_later_page_is_ignored():
+    fetch = fake_source(100, totals={2: 500})
+    assert len(list(iter_paged(fetch, 50))) == 100
+
+
+def test_write_rows_csv_and_jsonl(tmp_path):
+    rows = [{"TITLE": "딥러닝", "AUTHOR": "가"}, {"TITLE": "LLM", "AUTHOR": "나", "EXTRA": 1}]
+
+    n = write_rows(iter(rows), tmp_path / "out.csv", "csv", ("TITLE", "AUTHOR"))
+    with open(tmp_path / "out.csv", encoding="utf-8-sig", newline="") as fp:
+        assert n == 2 and list(csv.DictReader(fp)) == [{"TITLE": "딥러닝", "AUTHOR": "가"},
+                                                          {"TITLE": "LLM", "AUTHOR": "나"}]
+
+    n = write_rows(iter(rows), tmp_path / "out.jsonl", "jsonl", ("TITLE", "YEAR"))
+    lines = (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()
+    assert n == 2 and json.loads(lines[0]) == {"TITLE": "딥러닝", "YEAR": ""}
+
+
+def test_write_rows_stops_paging_on_error(tmp_path):
+    fetch = fake_source(500, fail_pages={3})
+    rows = chain_sources([("알라딘", iter_paged(fetch, 100))])
+    with pytest.raises(ExportIncomplete):
+        write_rows(rows, tmp_path / "out.csv", "csv", ("SOURCE", "TITLE"))
+    assert fetch.calls == [1, 2, 3]
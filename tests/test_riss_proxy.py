@@ -0,0 +1,155 @@
+"""riss_proxy.py 페이지 분할 · 배치 캐시 테스트 (원본 RISS는 스텁 XML로 대체)"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import riss_proxy
+
+
+def stub_xml(keyword, start, rowcount, total):
+    rows = "".join(
+        f"<metadata><riss.title>{keyword} {i}</riss.title><url>u{i}</url></metadata>"
+        for i in range(start, min(total, start + rowcount - 1) + 1)
+    )
+    return f"<record><head><totalcount>{total}</totalcount></head>{rows}</record>"
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """fetch_upstream_batch를 스텁으로 바꾸고 호출된 (keyword, batch_no)를 기록"""
+    state = {"total": 1283, "ignore_start": False, "calls": []}
+
+    def fake_fetch(keyword, batch_no):
+        state["calls"].append((keyword, batch_no))
+        start = 1 if state["ignore_start"] else batch_no * riss_proxy.RISS_BATCH_SIZE + 1
+        return riss_proxy.parse_riss_xml(stub_xml(keyword, start, riss_proxy.RISS_BATCH_SIZE, state["total"]))
+
+    monkeypatch.setattr(riss_proxy, "fetch_upstream_batch", fake_fetch)
+    monkeypatch.setattr(riss_proxy, "batch_cache", riss_proxy.BatchCache())
+    return state
+
+
+@pytest.fixture
+def client():
+    return TestClient(riss_proxy.app)
+
+
+def titles(resp):
+    return [d["TITLE"] for d in resp.json()["docs"]]
+
+
+def test_first_page(client, upstream):
+    resp = client.get("/page", params={"keyword": "딥러닝", "page": 1, "size": 10})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1283
+    assert body["available"] == riss_proxy.RISS_PROXY_MAX_RECORDS
+    assert titles(resp) == [f"딥러닝 {i}" for i in range(1, 11)]
+
+
+def test_pages_10_and_11_cross_batch_boundary(client, upstream):
+    page10 = client.get("/page", params={"keyword": "딥러닝", "page": 10})
+    page11 = client.get("/page", params={"keyword": "딥러닝", "page": 11})
+    assert titles(page10) == [f"딥러닝 {i}" for i in range(91, 101)]
+    assert titles(page11) == [f"딥러닝 {i}" for i in range(101, 111)]
+    # 배치 0은 한 번만, 배치 1은 11페이지에서 처음 받아온다.
+    assert upstream["calls"] == [("딥러닝", 0), ("딥러닝", 1)]
+
+
+def test_page_straddling_batches(client, upstream):
+    resp = client.get("/page", params={"keyword": "딥러닝", "page": 3, "size": 45})
+    assert titles(resp) == [f"딥러닝 {i}" for i in range(91, 136)]
+
+
+def test_page_past_available_is_empty(client, upstream):
+    last = client.get("/page", params={"keyword": "딥러닝", "page": 100})
+    past = client.get("/page", params={"keyword": "딥러닝", "page": 101})
+    assert titles(last) == [f"딥러닝 {i}" for i in range(991, 1001)]
+    assert past.json()["docs"] == []
+    assert past.json()["available"] == 1000
+
+
+def test_small_total_clamps_available(client, upstream):
+    upstream["total"] = 37
+    resp = client.get("/page", params={"keyword": "x", "page": 4})
+    assert resp.json()["available"] == 37
+    assert titles(resp) == [f"x {i}" for i in range(31, 38)]
+
+
+def test_upstream_ignoring_start_falls_back_to_first_batch(client, upstream):
+    upstream["ignore_start"] = True
+    page10 = client.get("/page", params={"keyword": "딥러닝", "page": 10})
+    page11 = client.get("/page", params={"keyword": "딥러닝", "page": 11})
+    assert titles(page10) == [f"딥러닝 {i}" for i in range(91, 101)]
+    assert page11.json()["docs"] == []
+    assert page11.json()["available"] == riss_proxy.RISS_BATCH_SIZE
+
+
+def test_equivalent_queries_share_cache(client, upstream):
+    client.get("/page", params={"keyword": "ＡＩ  정책"})
+    client.get("/page", params={"keyword": "ai 정책"})
+    assert len(upstream["calls"]) == 1
+
+
+def test_upstream_error_is_502(client, monkeypatch):
+    def boom(keyword, batch_no):
+        raise RuntimeError("down")
+
+    monkeypatch.setattr(riss_proxy, "fetch_upstream_batch", boom)
+    monkeypatch.setattr(riss_proxy, "batch_cache", riss_proxy.BatchCache())
+    assert client.get("/page", params={"keyword": "x"}).status_code == 502
+    assert client.get("/page", params={"keyword": "y"}).status_code == 502
+    assert riss_proxy.batch_cache._key_locks == {}
+
+
+def test_oversized_page_rejected(client, upstream):
+    resp = client.get("/page", params={"keyword": "x", "size": riss_proxy.MAX_PAGE_SIZE + 1})
+    assert resp.status_code == 422
+
+
+def test_batch_cache_lru_eviction():
+    cache = riss_proxy.BatchCache(max_items=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a가 최근 사용
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_batch_cache_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(riss_proxy.time, "monotonic", lambda: now[0])
+    cache = riss_proxy.BatchCache(max_items=10, ttl=5)
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 1
+    assert cache.get("a") is None
+
+
+def test_batch_cache_dedups_concurrent_fetch():
+    cache = riss_proxy.BatchCache(max_items=10, ttl=60)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    def worker(results):
+        barrier.wait()
+        results.append(cache.get_or_fetch("k", fetch))
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["value"] * 8
+    assert len(calls) == 1
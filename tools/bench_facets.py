@@ -0,0 +1,61 @@
+"""
+전남연구원 패싯 집계 시간 측정 스크립트.
+
+검색 결과(히트 인덱스)가 주어졌을 때 facet_counts + apply_facets에 걸리는 시간을
+검색어별로 출력한다. (목표: 수천 건이 걸리는 넓은 검색어에서도 ~10 ms 이하)
+
+사용법:
+    python tools/bench_facets.py [검색어 ...]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from jndi_facets import (  # noqa: E402
+    FACET_KDC, FACET_YEAR, apply_facets, build_facet_columns, facet_counts,
+)
+from query_normalize import query_cache_key  # noqa: E402
+
+DEFAULT_QUERIES = ["연구", "전남", "정책", "발전", "a"]
+REPEAT = 50
+
+
+def main(argv):
+    records = json.loads((ROOT / "static" / "전남연구원.json").read_text(encoding="utf-8"))
+
+    t0 = time.perf_counter()
+    columns = build_facet_columns(records)
+    title_keys = [query_cache_key(r.get("서명") or "") for r in records]
+    print(f"레코드 {len(records)}건, 열 구성 {(time.perf_counter() - t0) * 1000:.1f} ms")
+    print(f"{'검색어':<10}{'히트':>8}{'패싯 없음(ms)':>16}{'패싯 2개 선택(ms)':>20}")
+
+    for q in argv or DEFAULT_QUERIES:
+        key = query_cache_key(q)
+        hit_idx = np.asarray([i for i, t in enumerate(title_keys) if key in t], dtype=np.int32)
+
+        def run(selected):
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                facet_counts(columns, hit_idx, selected)
+                apply_facets(columns, hit_idx, selected)
+            return (time.perf_counter() - start) * 1000 / REPEAT
+
+        plain = run({})
+        counts = facet_counts(columns, hit_idx, {})
+        selected = {
+            FACET_YEAR: counts[FACET_YEAR][0][0] if counts[FACET_YEAR] else None,
+            FACET_KDC: counts[FACET_KDC][0][0] if counts[FACET_KDC] else None,
+        }
+        print(f"{q:<10}{len(hit_idx):>8}{plain:>16.3f}{run(selected):>20.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
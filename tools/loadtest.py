@@ -0,0 +1,604 @@
+"""
+Streamlit 앱 동시 세션 부하 테스트.
+
+실제 `streamlit run app.py` 서버를 띄우고, 브라우저와 같은 웹소켓 프로토콜(/_stcore/stream)로
+N개의 세션을 동시에 붙여 검색 → 페이지 클릭 → 페이지 블록 확장(11페이지 이상)을 반복한다.
+외부 API는 tools/stub_upstreams.py 스텁(응답 지연 설정 가능)으로 대체한다.
+
+측정 항목 (동시 세션 수 단계별):
+- 동작별 응답 시간 p50/p90/p95/p99/max (요청 전송 → 스크립트 실행 완료, st.rerun 포함)
+- 서버 프로세스 CPU 사용량, RSS(최대), 스레드 수(평균/최대) — Linux /proc 기준
+- SQLite 사용량 DB 쓰기/커밋 소요 시간(잠금 대기 포함) 분포
+- 앱 예외 수와 동작별 경고/오류 안내 수(외부 API · 프록시 호출 오류 등)
+  — 하나라도 있는 단계는 용량(SLO 충족 최대 세션) 판정에서 제외한다.
+
+결과는 JSON 용량 보고서로 저장하고, 릴리스 간 비교는 compare 명령으로 한다.
+
+사용법:
+    python tools/loadtest.py run --sessions 1,5,10,20 --iterations 2 --out capacity.json
+    python tools/loadtest.py run --sessions 10 --riss-proxy --upstream-latency-ms 300
+    python tools/loadtest.py compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+SAMPLE_LOG = ROOT / "tools" / "sample_queries.txt"
+
+# app.py 위젯 라벨
+SEARCH_INPUT_LABEL = "도서 제목을 입력하세요"
+SEARCH_BUTTON_LABEL = "검색"
+PAGER_LABELS = ("JNDI 페이지", "NLK 페이지", "ALADIN 페이지", "RISS 페이지")
+BLOCK_PAGER_LABELS = ("NLK 페이지", "ALADIN 페이지")  # 11페이지부터 prefetch 블록 확장
+QUOTA_MESSAGE = "일사용량을 초과했다"
+
+WIDGET_TYPES = ("text_input", "button", "radio", "selectbox")
+SQLITE_CONTENDED_MS = 1.0
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE_BYTES = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# -----------------------------
+# 서버 측: SQLite 계측 후 Streamlit 실행 (serve 명령, 내부용)
+# -----------------------------
+def serve_app(port: int, sqlite_stats_path: Path, streamlit_args) -> None:
+    """
+    sqlite3.connect를 계측용 Connection 팩토리로 감싼 뒤 같은 프로세스에서 Streamlit을 실행한다.
+    app.py는 호출 시점에 sqlite3.connect를 찾으므로 코드 변경 없이 계측된다.
+    """
+    durations = []
+    lock = threading.Lock()
+
+    class TimedConnection(sqlite3.Connection):
+        def execute(self, sql, *args, **kwargs):
+            if sql.lstrip().upper().startswith("SELECT"):
+                return super().execute(sql, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return super().execute(sql, *args, **kwargs)
+            finally:
+                with lock:
+                    durations.append((time.perf_counter() - start) * 1000)
+
+        def __exit__(self, *exc):
+            # with 블록 종료 시 commit (EXCLUSIVE 잠금 획득 대기 포함)
+            start = time.perf_counter()
+            try:
+                return super().__exit__(*exc)
+            finally:
+                with lock:
+                    durations.append((time.perf_counter() - start) * 1000)
+
+    orig_connect = sqlite3.connect
+
+    def timed_connect(*args, **kwargs):
+        kwargs.setdefault("factory", TimedConnection)
+        return orig_connect(*args, **kwargs)
+
+    sqlite3.connect = timed_connect
+
+    def flush_forever():
+        while True:
+            time.sleep(0.5)
+            with lock:
+                snapshot = list(durations)
+            tmp = sqlite_stats_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"durations_ms": snapshot}), encoding="utf-8")
+            tmp.replace(sqlite_stats_path)
+
+    threading.Thread(target=flush_forever, name="sqlite-stats", daemon=True).start()
+
+    from streamlit.web import cli
+
+    sys.argv = ["streamlit", "run", str(ROOT / "app.py"), "--server.port", str(port), *streamlit_args]
+    cli.main()
+
+
+def start_server(port: int, work_dir: Path, secrets: dict):
+    """앱 서버 하위 프로세스 시작. 반환: (Popen, sqlite 통계 파일 경로)"""
+    secrets_path = work_dir / "secrets.toml"
+    secrets_path.write_text(
+        "".join(f'{k} = "{v}"\n' for k, v in secrets.items()), encoding="utf-8"
+    )
+    stats_path = work_dir / f"sqlite_{port}.json"
+    env = dict(os.environ, NAPI_USAGE_DB_PATH=str(work_dir / f"usage_{port}.db"))
+    streamlit_args = [
+        "--server.headless", "true",
+        "--server.fileWatcherType", "none",
+        "--browser.gatherUsageStats", "false",
+        "--secrets.files", str(secrets_path),
+        "--logger.level", "error",
+    ]
+    proc = subprocess.Popen(
+        [sys.executable, __file__, "serve", str(port), str(stats_path), "--", *streamlit_args],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    return proc, stats_path
+
+
+def wait_healthy(url: str, proc, name: str = "앱 서버", timeout: float = 60.0) -> None:
+    import requests
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"{name}가 종료됨:\n{proc.stderr.read().decode(errors='replace')}")
+        try:
+            if requests.get(url, timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{name} health check 시간 초과")
+
+
+def free_port() -> int:
+    import socket
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# -----------------------------
+# 서버 프로세스 자원 측정 (/proc)
+# -----------------------------
+class ProcSampler:
+    """interval마다 /proc/<pid>에서 CPU 시간, RSS, 스레드 수를 읽는다."""
+
+    def __init__(self, pid: int, interval: float = 0.25):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []  # (monotonic, cpu_sec, rss_bytes, threads)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="proc-sampler", daemon=True)
+
+    def read(self):
+        with open(f"/proc/{self.pid}/stat", encoding="ascii") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu_sec = (int(fields[11]) + int(fields[12])) / CLK_TCK  # utime + stime
+        rss = int(fields[21]) * PAGE_SIZE_BYTES
+        threads = int(fields[17])
+        return time.monotonic(), cpu_sec, rss, threads
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.samples.append(self.read())
+            except (OSError, ValueError, IndexError):
+                return
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self.samples.append(self.read())
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        try:
+            self.samples.append(self.read())
+        except (OSError, ValueError, IndexError):
+            pass
+
+    def summary(self):
+        first, last = self.samples[0], self.samples[-1]
+        wall = max(last[0] - first[0], 1e-9)
+        cpu = last[1] - first[1]
+        return {
+            "cpu_sec": round(cpu, 2),
+            "cpu_cores_avg": round(cpu / wall, 2),
+            "rss_mb_start": round(first[2] / 2**20, 1),
+            "rss_mb_peak": round(max(s[2] for s in self.samples) / 2**20, 1),
+            "threads_avg": round(sum(s[3] for s in self.samples) / len(self.samples), 1),
+            "threads_peak": max(s[3] for s in self.samples),
+        }
+
+
+# -----------------------------
+# 클라이언트 측: 웹소켓 세션 흉내
+# -----------------------------
+class SimulatedSession:
+    """브라우저 탭 하나. 위젯 상태를 보내 스크립트를 재실행하고 완료까지 기다린다."""
+
+    def __init__(self, port: int):
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.ws = None
+        self.page_script_hash = ""
+        self.widgets = {}  # 라벨 → (위젯 종류, proto)
+        self.quota_rejected = False
+        self.alerts = []  # 마지막 실행에서 받은 st.warning/st.error 본문 (쿼터 안내 제외)
+        self.exceptions = 0
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, subprotocols=["streamlit"], max_message_size=64 * 2**20)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, widget_states=(), timeout: float = 120.0) -> float:
+        """위젯 상태로 재실행 요청 → 최종 실행 완료까지 걸린 시간(초)"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        msg.rerun_script.widget_states.widgets.extend(widget_states)
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), timeout)
+            if raw is None:
+                raise ConnectionError("웹소켓이 닫혔습니다.")
+            fwd = ForwardMsg.FromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                # 스크립트 실행마다 새로 그려지므로 위젯 목록도 새로 모은다.
+                self.page_script_hash = fwd.new_session.page_script_hash
+                self.widgets = {}
+                self.quota_rejected = False
+                self.alerts = []
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._on_element(fwd.delta.new_element)
+            elif kind == "script_finished":
+                status = fwd.script_finished
+                if status in (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR):
+                    return time.perf_counter() - start
+                # FINISHED_EARLY_FOR_RERUN: st.rerun() 뒤 재실행이 이어진다.
+
+    def _on_element(self, element):
+        from streamlit.proto.Alert_pb2 import Alert
+
+        kind = element.WhichOneof("type")
+        if kind in WIDGET_TYPES:
+            widget = getattr(element, kind)
+            self.widgets[widget.label] = (kind, widget)
+        elif kind == "alert" and QUOTA_MESSAGE in element.alert.body:
+            self.quota_rejected = True
+        elif kind == "alert" and element.alert.format in (Alert.ERROR, Alert.WARNING):
+            # 외부 API/프록시 호출 오류 등 앱이 화면에 띄운 실패 안내
+            self.alerts.append(element.alert.body)
+        elif kind == "exception":
+            self.exceptions += 1
+
+    def search_states(self, query: str):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        _, text_input = self.widgets[SEARCH_INPUT_LABEL]
+        _, button = self.widgets[SEARCH_BUTTON_LABEL]
+        return [
+            WidgetState(id=text_input.id, string_value=query),
+            WidgetState(id=button.id, trigger_value=True),
+        ]
+
+    def radio_state(self, label: str, option: str):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        _, radio = self.widgets[label]
+        return [WidgetState(id=radio.id, string_value=option)]
+
+    def radio_options(self, label: str):
+        widget = self.widgets.get(label)
+        return list(widget[1].options) if widget else []
+
+
+async def run_session(session_no: int, port: int, queries, args, results):
+    """세션 하나의 시나리오: (검색 → 각 열 페이지 클릭 → 블록 확장) × iterations"""
+    rng = random.Random(args.seed + session_no)
+    think = args.think_ms / 1000
+
+    async def act(name, states=()):
+        elapsed = await session.rerun(states)
+        results["latency"].setdefault(name, []).append(elapsed)
+        if session.alerts:
+            results["alerts"][name] += len(session.alerts)
+            results["alert_messages"].update(alert_key(body) for body in session.alerts)
+        await asyncio.sleep(think * rng.uniform(0.5, 1.5))
+
+    session = SimulatedSession(port)
+    try:
+        await session.connect()
+        await act("initial")
+        for _ in range(args.iterations):
+            await act("search", session.search_states(rng.choice(queries)))
+            if session.quota_rejected:
+                results["quota_rejections"] += 1
+                continue
+
+            for label in PAGER_LABELS:
+                opts = session.radio_options(label)
+                if len(opts) > 1:
+                    await act("page_click", session.radio_state(label, rng.choice(opts[1:])))
+
+            for label in BLOCK_PAGER_LABELS:
+                # 창의 마지막 페이지를 계속 눌러 11페이지(다음 prefetch 블록)까지 이동
+                for _ in range(10):
+                    opts = session.radio_options(label)
+                    if not opts:
+                        break
+                    target = opts[-1]
+                    if int(target) > 10:
+                        target = str(min(int(o) for o in opts if int(o) > 10))
+                        await act("block_extend", session.radio_state(label, target))
+                        break
+                    await act("page_click", session.radio_state(label, target))
+    except Exception as e:  # noqa: BLE001 - 세션 하나의 실패는 기록만 하고 계속
+        results["errors"].append(f"session {session_no}: {type(e).__name__}: {e}")
+    finally:
+        results["exceptions"] += session.exceptions
+        session.close()
+
+
+# -----------------------------
+# 집계
+# -----------------------------
+def alert_key(body: str) -> str:
+    """경고 본문에서 예외 상세(': ' 뒤)를 떼어 같은 종류끼리 묶는다."""
+    return body.split(": ", 1)[0][:80]
+
+
+def percentile(sorted_vals, p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(p / 100 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+def latency_summary(values_sec):
+    vals = sorted(v * 1000 for v in values_sec)
+    return {
+        "count": len(vals),
+        "p50_ms": round(percentile(vals, 50), 1),
+        "p90_ms": round(percentile(vals, 90), 1),
+        "p95_ms": round(percentile(vals, 95), 1),
+        "p99_ms": round(percentile(vals, 99), 1),
+        "max_ms": round(vals[-1], 1) if vals else 0.0,
+    }
+
+
+def sqlite_summary(stats_path: Path):
+    try:
+        durations = json.loads(stats_path.read_text(encoding="utf-8"))["durations_ms"]
+    except (OSError, ValueError, KeyError):
+        return {"ops": 0}
+    vals = sorted(durations)
+    return {
+        "ops": len(vals),
+        "total_ms": round(sum(vals), 1),
+        "p95_ms": round(percentile(vals, 95), 2),
+        "max_ms": round(vals[-1], 2) if vals else 0.0,
+        f"over_{SQLITE_CONTENDED_MS:g}ms": sum(1 for v in vals if v > SQLITE_CONTENDED_MS),
+    }
+
+
+def run_level(n_sessions: int, args, queries, secrets, work_dir: Path):
+    port = free_port()
+    proc, stats_path = start_server(port, work_dir, secrets)
+    try:
+        wait_healthy(f"http://127.0.0.1:{port}/_stcore/health", proc)
+        sampler = ProcSampler(proc.pid)
+        results = {
+            "latency": {}, "errors": [], "quota_rejections": 0, "exceptions": 0,
+            "alerts": Counter(), "alert_messages": Counter(),
+        }
+
+        async def run_all():
+            await asyncio.gather(*(run_session(i, port, queries, args, results) for i in range(n_sessions)))
+
+        sampler.start()
+        started = time.monotonic()
+        asyncio.run(run_all())
+        wall = time.monotonic() - started
+        sampler.stop()
+        time.sleep(0.6)  # SQLite 통계 마지막 flush 대기
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+    all_latency = [v for vals in results["latency"].values() for v in vals]
+    return {
+        "sessions": n_sessions,
+        "wall_sec": round(wall, 2),
+        "actions_per_sec": round(len(all_latency) / wall, 2) if wall else 0.0,
+        "latency": {
+            "all": latency_summary(all_latency),
+            **{name: latency_summary(vals) for name, vals in sorted(results["latency"].items())},
+        },
+        "server": sampler.summary(),
+        "sqlite": sqlite_summary(stats_path),
+        "errors": results["errors"],
+        "app_exceptions": results["exceptions"],
+        "app_alerts": {
+            "total": sum(results["alerts"].values()),
+            "by_action": dict(sorted(results["alerts"].items())),
+            "messages": dict(results["alert_messages"].most_common(10)),
+        },
+        "quota_rejections": results["quota_rejections"],
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_levels(levels) -> None:
+    print(f"{'세션':>4} {'동작/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'CPU코어':>7} "
+          f"{'RSS MB':>7} {'스레드':>6} {'SQLite p95':>10} {'오류':>4} {'경고':>4}")
+    for lv in levels:
+        lat, srv, sq = lv["latency"]["all"], lv["server"], lv["sqlite"]
+        print(f"{lv['sessions']:>4} {lv['actions_per_sec']:>7} {lat['p50_ms']:>8} {lat['p95_ms']:>8} "
+              f"{lat['p99_ms']:>8} {srv['cpu_cores_avg']:>7} {srv['rss_mb_peak']:>7} {srv['threads_peak']:>6} "
+              f"{sq.get('p95_ms', 0):>10} {len(lv['errors']) + lv['app_exceptions']:>4} "
+              f"{lv['app_alerts']['total']:>4}")
+
+
+def level_clean(lv) -> bool:
+    """세션 오류 · 앱 예외 · 앱 경고(외부 API/프록시 호출 오류 등)가 하나도 없는 단계"""
+    return not lv["errors"] and not lv["app_exceptions"] and not lv["app_alerts"]["total"]
+
+
+def cmd_run(args) -> int:
+    from stub_upstreams import start_stub_server
+
+    queries = [q for q in SAMPLE_LOG.read_text(encoding="utf-8").splitlines() if q.strip()]
+    levels_to_run = [int(n) for n in args.sessions.split(",") if n.strip()]
+
+    stub, stub_base = start_stub_server(0, args.upstream_latency_ms)
+    secrets = {
+        "NLK_OPENAPI_KEY": "stub", "ALADIN_TTB_KEY": "stub", "RISS_API_KEY": "stub",
+        "NLK_API_URL": f"{stub_base}/nlk",
+        "ALADIN_API_URL": f"{stub_base}/aladin",
+        "RISS_API_URL": f"{stub_base}/riss",
+    }
+    proxy = None
+    if args.riss_proxy:
+        proxy_port = free_port()
+        proxy = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "riss_proxy:app", "--port", str(proxy_port), "--log-level", "error"],
+            cwd=ROOT, env=dict(os.environ, RISS_API_KEY="stub", RISS_UPSTREAM_URL=f"{stub_base}/riss"),
+            stderr=subprocess.PIPE,
+        )
+        secrets["RISS_PAGED_PROXY_BASE"] = f"http://127.0.0.1:{proxy_port}"
+
+    levels = []
+    try:
+        if proxy is not None:
+            # 프록시가 뜨기 전에 측정을 시작하면 첫 구간 RISS 호출이 연결 오류로 잡힌다.
+            wait_healthy(f"http://127.0.0.1:{proxy_port}/health", proxy, name="RISS 프록시")
+        with tempfile.TemporaryDirectory(prefix="napi-loadtest-") as tmp:
+            for n in levels_to_run:
+                print(f"동시 세션 {n}개 실행 중…", flush=True)
+                levels.append(run_level(n, args, queries, secrets, Path(tmp)))
+    finally:
+        stub.shutdown()
+        if proxy is not None:
+            proxy.terminate()
+
+    within_slo = [lv["sessions"] for lv in levels
+                  if lv["latency"]["all"]["p95_ms"] <= args.slo_p95_ms and level_clean(lv)]
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "streamlit": __import__("streamlit").__version__,
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if k != "func"},
+        },
+        "levels": levels,
+        "capacity": {
+            "slo_p95_ms": args.slo_p95_ms,
+            "max_sessions_within_slo": max(within_slo) if within_slo else 0,
+        },
+    }
+
+    print_levels(levels)
+    print(f"p95 ≤ {args.slo_p95_ms:g} ms 를 지킨 최대 동시 세션: {report['capacity']['max_sessions_within_slo']}")
+    for lv in levels:
+        for err in lv["errors"][:5]:
+            print(f"  [세션 {lv['sessions']}] {err}")
+        for msg, count in list(lv["app_alerts"]["messages"].items())[:5]:
+            print(f"  [세션 {lv['sessions']}] 경고 {count}회: {msg}")
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"보고서 저장: {args.out}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    """두 보고서에서 같은 세션 수 단계끼리 주요 지표를 비교"""
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    print(f"기준 {base['meta']['git_revision']} ({base['meta']['created_at']}) → "
+          f"비교 {new['meta']['git_revision']} ({new['meta']['created_at']})")
+
+    metrics = (
+        ("p95 ms", lambda lv: lv["latency"]["all"]["p95_ms"]),
+        ("p99 ms", lambda lv: lv["latency"]["all"]["p99_ms"]),
+        ("동작/s", lambda lv: lv["actions_per_sec"]),
+        ("CPU 코어", lambda lv: lv["server"]["cpu_cores_avg"]),
+        ("RSS MB", lambda lv: lv["server"]["rss_mb_peak"]),
+        ("스레드", lambda lv: lv["server"]["threads_peak"]),
+        ("SQLite p95 ms", lambda lv: lv["sqlite"].get("p95_ms", 0)),
+        ("앱 예외", lambda lv: lv["app_exceptions"]),
+        ("앱 경고", lambda lv: lv.get("app_alerts", {}).get("total", 0)),
+    )
+    base_levels = {lv["sessions"]: lv for lv in base["levels"]}
+    for lv in new["levels"]:
+        old = base_levels.get(lv["sessions"])
+        if old is None:
+            continue
+        print(f"\n동시 세션 {lv['sessions']}")
+        for name, get in metrics:
+            a, b = get(old), get(lv)
+            change = f"{(b - a) / a:+.1%}" if a else "-"
+            print(f"  {name:<14}{a:>10}{b:>10}{change:>10}")
+    print(f"\n최대 동시 세션(SLO): {base['capacity']['max_sessions_within_slo']} → "
+          f"{new['capacity']['max_sessions_within_slo']}")
+    return 0
+
+
+def main(argv):
+    if argv[:1] == ["serve"]:
+        # 내부용: python tools/loadtest.py serve <port> <sqlite_stats_path> -- <streamlit 옵션>
+        port, stats_path = int(argv[1]), Path(argv[2])
+        serve_app(port, stats_path, argv[4:] if argv[3:4] == ["--"] else argv[3:])
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="부하 테스트 실행")
+    p_run.add_argument("--sessions", default="1,5,10", help="동시 세션 수 단계 (쉼표 구분)")
+    p_run.add_argument("--iterations", type=int, default=2, help="세션당 검색 시나리오 반복 횟수")
+    p_run.add_argument("--think-ms", type=float, default=200.0, help="동작 사이 평균 대기(ms)")
+    p_run.add_argument("--upstream-latency-ms", type=float, default=100.0, help="스텁 API 응답 지연(ms)")
+    p_run.add_argument("--riss-proxy", action="store_true", help="riss_proxy.py(원본=스텁 서버)를 거쳐 RISS 페이지 조회")
+    p_run.add_argument("--slo-p95-ms", type=float, default=3000.0, help="용량 판정 기준 p95(ms)")
+    p_run.add_argument("--seed", type=int, default=0)
+    p_run.add_argument("--out", help="JSON 보고서 저장 경로")
+    p_run.set_defaults(func=cmd_run)
+
+    p_cmp = sub.add_parser("compare", help="두 보고서 비교")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("new")
+    p_cmp.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+검색어 로그로 캐시 적중률을 비교하는 스크립트.
+
+기존 캐시 키(strip()만 적용)와 query_cache_key() 표준형을 같은 로그에 적용해
+prefetch_nlk / prefetch_aladin / prefetch_riss 캐시의 적중률 차이를 출력한다.
+(캐시는 무제한 · 만료 없음으로 가정: 같은 키가 두 번째로 나오면 적중)
+
+사용법:
+    python tools/query_cache_report.py [검색어 로그 파일 ...]
+    (인자가 없으면 tools/sample_queries.txt 사용, 한 줄에 검색어 하나)
+
+tools/sample_queries.txt는 대소문자·전각·공백·조합형 변형을 일부러 많이 넣어 손으로 만든
+합성 로그라, 그 결과는 실제 트래픽이 아닌 상한에 가까운 값이다.
+실제 효과는 운영 검색어 로그를 인자로 넘겨 확인한다.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from query_normalize import query_cache_key  # noqa: E402
+
+SAMPLE_LOG = Path(__file__).resolve().parent / "sample_queries.txt"
+
+
+def simulate_hits(queries, key_func):
+    """반환: (적중 수, 서로 다른 키 수)"""
+    seen = set()
+    hits = 0
+    for q in queries:
+        key = key_func(q)
+        if key in seen:
+            hits += 1
+        else:
+            seen.add(key)
+    return hits, len(seen)
+
+
+def load_queries(paths):
+    queries = []
+    for p in paths:
+        for line in Path(p).read_text(encoding="utf-8").splitlines():
+            # 기존 앱과 같이 빈 검색어는 API 호출이 없으므로 제외
+            if line.strip():
+                queries.append(line)
+    return queries
+
+
+def main(argv):
+    paths = argv or [SAMPLE_LOG]
+    queries = load_queries(paths)
+    if not queries:
+        print("검색어가 없습니다.")
+        return 1
+
+    total = len(queries)
+    old_hits, old_keys = simulate_hits(queries, str.strip)
+    new_hits, new_keys = simulate_hits(queries, query_cache_key)
+
+    print(f"검색어 {total}건 ({', '.join(str(p) for p in paths)})")
+    if not argv:
+        print("※ 변형 검색어를 일부러 모은 합성 로그입니다. 적중률 개선폭은 상한 참고치로만 보세요.")
+    print(f"{'캐시 키':<24}{'고유 키':>8}{'적중':>8}{'적중률':>10}")
+    print(f"{'strip() (기존)':<24}{old_keys:>8}{old_hits:>8}{old_hits / total:>10.1%}")
+    print(f"{'query_cache_key()':<24}{new_keys:>8}{new_hits:>8}{new_hits / total:>10.1%}")
+    print(f"외부 API 호출 절감: {old_keys - new_keys}건 "
+          f"(적중률 +{(new_hits - old_hits) / total:.1%}p)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
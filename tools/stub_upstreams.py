@@ -0,0 +1,148 @@
+"""
+NLK / 알라딘 / RISS Open API 로컬 스텁 서버.
+
+각 API와 같은 구조의 XML을 키워드에서 결정적으로 만들어 돌려준다. (외부 호출 없음)
+부하 테스트(tools/loadtest.py)에서 쓰며, 단독으로 띄워 개발용으로도 쓸 수 있다.
+
+    python tools/stub_upstreams.py --port 8090 --latency-ms 150
+
+앱 Secrets:
+    NLK_API_URL    = "http://127.0.0.1:8090/nlk"
+    ALADIN_API_URL = "http://127.0.0.1:8090/aladin"
+    RISS_API_URL   = "http://127.0.0.1:8090/riss"
+    (키 값은 아무 문자열이나 가능)
+"""
+
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+ALADIN_NS = "http://www.aladin.co.kr/ttb/apiguide.aspx"
+
+
+def stub_total(keyword: str, spread: int) -> int:
+    """키워드별로 고정된 가짜 전체 건수"""
+    return 0 if not keyword else 7 + (sum(map(ord, keyword)) % spread)
+
+
+def _int(params, name, default):
+    try:
+        return int(params.get(name, [default])[0])
+    except ValueError:
+        return default
+
+
+def nlk_xml(params) -> str:
+    kw = params.get("kwd", [""])[0]
+    page, size = _int(params, "pageNum", 1), _int(params, "pageSize", 10)
+    total = stub_total(kw, 3000)
+    start = (page - 1) * size
+    items = "".join(
+        "<item>"
+        f"<title_info>{escape(kw)} 국중 {i + 1}</title_info>"
+        f"<author_info>저자 {i % 89}</author_info>"
+        f"<pub_info>출판사 {i % 17}</pub_info>"
+        f"<pub_year_info>{1980 + i % 45}</pub_year_info>"
+        f"<isbn>97889{i:08d}</isbn>"
+        f"<detail_link>/NL/contents/stub/{i + 1}</detail_link>"
+        "</item>"
+        for i in range(start, min(total, start + size))
+    )
+    return f"<root><paramData><total>{total}</total></paramData><result>{items}</result></root>"
+
+
+def aladin_xml(params) -> str:
+    kw = params.get("Query", [""])[0]
+    page, size = _int(params, "start", 1), _int(params, "MaxResults", 10)
+    total = stub_total(kw, 400)
+    start = (page - 1) * size
+    items = "".join(
+        "<item>"
+        f"<title>{escape(kw)} 알라딘 {i + 1}</title>"
+        f"<link>https://www.aladin.co.kr/stub/{i + 1}</link>"
+        f"<author>저자 {i % 53}</author>"
+        f"<publisher>출판사 {i % 11}</publisher>"
+        f"<pubDate>20{i % 25:02d}-01-01</pubDate>"
+        f"<isbn13>97911{i:08d}</isbn13>"
+        "</item>"
+        for i in range(start, min(total, start + size))
+    )
+    return f'<object xmlns="{ALADIN_NS}"><totalResults>{total}</totalResults>{items}</object>'
+
+
+def riss_xml(params) -> str:
+    """RISS Open API와 같은 구조. 배치 시작 위치는 start(1-based, riss_proxy.py 기본값)"""
+    kw = params.get("keyword", [""])[0]
+    start = _int(params, "start", 1)
+    rowcount = min(_int(params, "rowcount", 10), 100)
+    total = stub_total(kw, 2000)
+    rows = "".join(
+        "<metadata>"
+        f"<riss.title>{escape(kw)} 연구 {i}</riss.title>"
+        f"<riss.author>저자 {i % 97}</riss.author>"
+        f"<riss.publisher>출판사 {i % 13}</riss.publisher>"
+        f"<riss.pubdate>{1990 + i % 35}</riss.pubdate>"
+        "<riss.mtype>단행본</riss.mtype>"
+        f"<riss.holdings>소장기관 {i % 7}</riss.holdings>"
+        f"<url>http://www.riss.kr/stub/{i}</url>"
+        "</metadata>"
+        for i in range(start, min(total, start + rowcount - 1) + 1)
+    )
+    return f"<record><head><totalcount>{total}</totalcount></head>{rows}</record>"
+
+
+ROUTES = {"/nlk": nlk_xml, "/aladin": aladin_xml, "/riss": riss_xml}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency_sec = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip("/"))
+        if route is None:
+            self.send_error(404)
+            return
+        if self.latency_sec:
+            time.sleep(self.latency_sec)  # 외부 API 응답 지연 흉내
+        body = route(parse_qs(url.query)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, latency_ms: float = 0.0):
+    """백그라운드 스레드에서 스텁 서버 시작. 반환: (server, base_url)"""
+    handler = type("StubHandlerWithLatency", (StubHandler,), {"latency_sec": latency_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-upstreams", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="응답마다 추가할 지연(ms)")
+    args = parser.parse_args(argv)
+
+    server, base = start_stub_server(args.port, args.latency_ms)
+    print(f"스텁 서버: {base}/nlk · {base}/aladin · {base}/riss (Ctrl+C로 종료)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))